@@ -153,7 +153,7 @@ def log_request():
     request_metrics['total_requests'] += 1
     
     log_prefix = f"[LOAD_TEST:{flask.g.request_id}]" if is_load_test else f"[{flask.g.request_id}]"
-    logger.info(f"{log_prefix} {flask.request.method} {flask.request.path}")
+    logger.info("%s %s %s", log_prefix, flask.request.method, flask.request.path)
 
 @app.after_request
 def log_response(response):
@@ -182,7 +182,7 @@ def log_response(response):
         request_metrics['errors'] += 1
     
     log_prefix = f"[LOAD_TEST:{flask.g.request_id}]" if flask.g.is_load_test else f"[{flask.g.request_id}]"
-    logger.info(f"{log_prefix} Status: {response.status_code}, Duration: {duration:.3f}s")
+    logger.info("%s Status: %s, Duration: %.3fs", log_prefix, response.status_code, duration)
     
     return response
 
@@ -1090,7 +1090,7 @@ def app_version_manifest():
                 resp.headers['Cache-Control'] = 'no-store'
                 return resp, 200
         except Exception as e:
-            logger.warning(f"app/version read failed for {path}: {e}")
+            logger.warning("app/version read failed for %s: %s", path, e)
     return flask.jsonify({"error": "version manifest not found"}), 404
 
 # -----------------------------------------------------------------------------
@@ -1161,7 +1161,7 @@ def method_not_allowed(error):
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return flask.jsonify({"error": "Internal server error"}), 500
 
 application = app
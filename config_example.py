@@ -17,6 +17,8 @@ DO_SPACES_ENDPOINT = 'https://sfo3.digitaloceanspaces.com'
 DO_SPACES_BUCKET = 'your-bucket-name'
 DO_SPACES_URL = 'https://your-bucket.sfo3.digitaloceanspaces.com'
 S3_PREFIX = 'theservicesexchange/'
+S3_MAX_POOL_CONNECTIONS = 64                        # pooled keep-alive connections per worker
+ACCOUNT_CACHE_TTL_SECONDS = 2                       # in-process account cache; keep short with >1 worker
 
 # OpenRouter (LLM capability matching)
 OPENROUTER_API_KEY = 'sk-or-v1-...'
@@ -27,9 +29,12 @@ OPENROUTER_FALLBACK_MODEL = 'anthropic/claude-3.5-haiku'
 # LLM settings
 LLM_TEMPERATURE = 0.7
 LLM_MAX_TOKENS = 800
+MATCH_CACHE_TTL_SECONDS = 3600   # in-process reuse of capability-match verdicts
+LLM_MATCH_TIMEOUT_SECONDS = 15   # ceiling; match calls adapt below it from observed latency
 
 # Application
 TOKEN_EXPIRY_SECONDS = 86400  # 24 hours
+PASSWORD_HASH_METHOD = 'scrypt'  # werkzeug method for new hashes, e.g. 'pbkdf2:sha256:600000'
 DEFAULT_MAX_DISTANCE_MILES = 10
 
 # RSE Seat NFT — ERC-721 on Base mainnet
@@ -57,6 +62,12 @@ PUBLIC_PORTFOLIO_ENABLED = True      # public portfolio API + pages
 
 # Grab cooldown (seconds). Taxi demos: set 30–60 in config.py for non-prod.
 GRAB_JOB_COOLDOWN_SECONDS = 900
+# Bids capability-matched per LLM call in /grab_job (ranked; stops at first match)
+GRAB_JOB_MATCH_CHUNK = 8
+
+# Queue chat/bulletin S3 writes on a background pool instead of blocking the
+# request. Faster sends, but a write pending when a worker dies is lost.
+WRITE_BEHIND_FEED_WRITES = False
 
 # Agent tokens: default expiry days when expires_at omitted (0 = no default expiry)
 AGENT_TOKEN_DEFAULT_EXPIRY_DAYS = 90
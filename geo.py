@@ -0,0 +1,163 @@
+"""
+Vectorised geographic helpers for scanning many bids against one point.
+
+handlers.calculate_distance stays the scalar reference; these functions
+compute the same Haversine distance for whole columns of coordinates at once
+so the per-bid trig runs in NumPy instead of the interpreter.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3959.0
+# Radii up to this use the equirectangular approximation (see distance_miles_within)
+EQUIRECTANGULAR_MAX_MILES = 50.0
+EQUIRECTANGULAR_MAX_LAT = 60.0
+
+
+def _coord(value: Any) -> float:
+    """Coerce a stored coordinate to float; missing or malformed -> NaN."""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def coordinate_arrays(records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract ``lat``/``lon`` columns from record dicts as float64 arrays.
+
+    Records without usable coordinates get NaN in both columns, which
+    propagates through haversine_miles as a NaN distance.
+    """
+    count = len(records)
+    lats = np.fromiter((_coord(r.get('lat')) for r in records), dtype=np.float64, count=count)
+    lons = np.fromiter((_coord(r.get('lon')) for r in records), dtype=np.float64, count=count)
+    missing = np.isnan(lats) | np.isnan(lons)
+    lats[missing] = np.nan
+    lons[missing] = np.nan
+    return lats, lons
+
+
+def _haversine_term(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """The Haversine ``a`` term, sin²(dlat/2) + cos·cos·sin²(dlon/2), in place."""
+    lat0_r = np.radians(float(lat0))
+    hav = np.radians(lats, out=out)                       # lat_i (rad)
+    cos_lat = np.cos(hav)
+    hav -= lat0_r
+    hav *= 0.5
+    np.sin(hav, out=hav)
+    np.square(hav, out=hav)                               # sin²(dlat/2)
+
+    dlon = np.subtract(lons, float(lon0))
+    dlon *= np.pi / 360.0                                 # radians, halved
+    np.sin(dlon, out=dlon)
+    np.square(dlon, out=dlon)                             # sin²(dlon/2)
+    cos_lat *= np.cos(lat0_r)
+    dlon *= cos_lat
+    hav += dlon
+    return hav
+
+
+def _haversine_finish(hav: np.ndarray) -> np.ndarray:
+    """Turn ``a`` terms into miles, in place."""
+    # Rounding can push antipodal points just past 1.0
+    np.minimum(hav, 1.0, out=hav)
+    np.sqrt(hav, out=hav)
+    np.arcsin(hav, out=hav)
+    hav *= 2 * EARTH_RADIUS_MILES
+    return hav
+
+
+def haversine_miles(
+    lat0: float,
+    lon0: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Great-circle distance in miles from (lat0, lon0) to every (lats[i], lons[i]).
+
+    Inputs are degrees. NaN coordinates yield NaN distances; note that
+    ``nan <= radius`` is False, so such points never pass a radius mask.
+
+    The ufuncs run in place on two scratch buffers (one of which is ``out``
+    when given), so a call allocates a fixed number of arrays regardless of
+    how many terms the formula has.
+    """
+    return _haversine_finish(_haversine_term(lat0, lon0, lats, lons, out))
+
+
+def bounding_box_mask(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray, radius_miles: float) -> np.ndarray:
+    """True where (lats[i], lons[i]) lies in the lat/lon box enclosing the radius.
+
+    The box is exact for a sphere (never excludes a point within the
+    radius), so it can prune before the trig. Near the poles, or when the
+    radius spans the globe, only the latitude bound is applied. Longitude
+    differences wrap across the antimeridian. NaN coordinates are outside.
+    """
+    angle = float(radius_miles) / EARTH_RADIUS_MILES
+    dlat = np.degrees(angle)
+    mask = np.abs(lats - float(lat0)) <= dlat
+    sin_ratio = np.sin(min(angle, np.pi / 2)) / np.cos(np.radians(float(lat0)))
+    if angle < np.pi / 2 and abs(float(lat0)) + dlat < 90 and sin_ratio < 1:
+        dlon = np.degrees(np.arcsin(sin_ratio))
+        mask &= np.abs((lons - float(lon0) + 180.0) % 360.0 - 180.0) <= dlon
+    return mask
+
+
+def _equirectangular_angle_sq(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Squared flat-earth central angle (radians²), cosine at the mean latitude."""
+    y = np.radians(lats - float(lat0))
+    x = np.radians((lons - float(lon0) + 180.0) % 360.0 - 180.0)
+    x *= np.cos(np.radians((lats + float(lat0)) * 0.5))
+    x *= x
+    y *= y
+    x += y
+    return x
+
+
+def equirectangular_miles(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Flat-earth distance in miles, scaled by the cosine of the mean latitude.
+
+    One cos and one sqrt per point instead of Haversine's sin/sin/cos/
+    arcsin/sqrt. Within EQUIRECTANGULAR_MAX_MILES of mid-latitude points it
+    agrees with haversine_miles to a few thousandths of a mile.
+    Longitude differences wrap across the antimeridian.
+    """
+    return EARTH_RADIUS_MILES * np.sqrt(_equirectangular_angle_sq(lat0, lon0, lats, lons))
+
+
+def distance_miles_within(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray, radius_miles: float) -> np.ndarray:
+    """Distances from (lat0, lon0), computed only for points inside the radius.
+
+    Points outside the radius's bounding box, or whose pre-sqrt term already
+    exceeds the radius's, come back as +inf, which compares the same against
+    the radius; only hits pay for sqrt/arcsin. NaN coordinates still yield
+    NaN. Small radii away from the poles use the equirectangular
+    approximation, everything else full Haversine.
+    """
+    out = np.full(lats.shape, np.inf)
+    out[np.isnan(lats) | np.isnan(lons)] = np.nan
+    box = bounding_box_mask(lat0, lon0, lats, lons, radius_miles)
+    if not box.any():
+        return out
+
+    angle = float(radius_miles) / EARTH_RADIUS_MILES
+    if float(radius_miles) <= EQUIRECTANGULAR_MAX_MILES and abs(float(lat0)) <= EQUIRECTANGULAR_MAX_LAT:
+        term = _equirectangular_angle_sq(lat0, lon0, lats[box], lons[box])
+        hit = term <= angle * angle
+        dist = EARTH_RADIUS_MILES * np.sqrt(term[hit])
+    else:
+        term = _haversine_term(lat0, lon0, lats[box], lons[box])
+        hit = term <= np.sin(min(angle, np.pi) / 2) ** 2
+        dist = _haversine_finish(term[hit])
+    in_box = np.full(term.shape, np.inf)
+    in_box[hit] = dist
+    out[box] = in_box
+    return out
@@ -11,21 +11,32 @@ import time
 import logging
 import math
 import hashlib
+import heapq
 import hmac
 import re
 import secrets
 import threading
 import requests
-from typing import Dict, List, Optional, Tuple, Union, Any
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple, Union, Any, Callable
 from werkzeug.security import generate_password_hash, check_password_hash
 
+import numpy as np
+
 import config
+import geo
 import seat_verification
 import privacy as privacy_mod
 from utils import (
     get_account, save_account, account_exists, get_signup_stats,
     save_token,
     save_bid, get_bid, delete_bid, get_all_bids, get_user_bids,
+    claim_bid, release_bid_claim,
     save_job, get_job, get_all_jobs, get_user_jobs,
     save_message, get_user_messages,
     save_bulletin, get_all_bulletins,
@@ -34,6 +45,7 @@ from utils import (
     get_follows, save_follows,
     get_username_by_slug, save_slug_mapping,
     get_contact_hash_record, save_contact_hash_record, delete_contact_hash_record,
+    get_geocode_record, save_geocode_record,
     save_avatar,
     get_shop_orders, save_shop_orders,
     get_all_accounts,
@@ -94,7 +106,7 @@ def _emit(event_type: str, **kwargs) -> None:
     try:
         append_activity_event(event_type, **kwargs)
     except Exception as e:
-        logger.warning(f"_emit failed {event_type}: {e}")
+        logger.warning("_emit failed %s: %s", event_type, e)
 
 
 def user_is_job_participant(username: str, job: Dict[str, Any]) -> bool:
@@ -151,6 +163,26 @@ _CHANNEL_PAYLOAD_MAX_BYTES = 8 * 1024
 _CHANNEL_POST_LIMIT_PER_MIN = 30
 _AGENT_STRUCTURED_LIMIT_PER_MIN = 10
 
+# Password hashing method for new hashes, passed straight to werkzeug
+# (e.g. 'scrypt', 'pbkdf2:sha256:600000'). Verification reads the method from
+# each stored hash, so changing it never breaks existing logins.
+_PASSWORD_HASH_METHOD = getattr(config, 'PASSWORD_HASH_METHOD', 'scrypt') or 'scrypt'
+
+
+@lru_cache(maxsize=1)
+def _password_hash_prefix() -> str:
+    """Method field werkzeug writes for _PASSWORD_HASH_METHOD, defaults expanded."""
+    return generate_password_hash('', method=_PASSWORD_HASH_METHOD).split('$', 1)[0]
+
+# Location-type compatibility as bitmasks: each bid type owns one bit and each
+# provider type maps to the mask of bid types it may take, so the grab_job scan
+# does a single AND per bid instead of a compare ladder.
+_LOCATION_BITS = {'physical': 0b001, 'hybrid': 0b010, 'remote': 0b100}
+_LOCATION_COMPAT = {'physical': 0b011, 'hybrid': 0b111, 'remote': 0b100}
+_LOCATION_ON_SITE = 0b011  # types that carry coordinates (distance applies)
+# Unknown types on either side are compatible with everything (no type filter)
+_LOCATION_ANY = 0b111
+
 _MAX_AGENTS_PER_ACCOUNT = 10
 _DEFAULT_AGENT_SCOPES = ['history:read']
 _ALL_AGENT_SCOPES = {
@@ -166,35 +198,38 @@ _ALL_AGENT_SCOPES = {
 # Helper Functions
 # -----------------------------------------------------------------------------
 
+_EARTH_RADIUS_MILES = 3959
+_DEG_TO_RAD = math.pi / 180
+
+
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two geographic points using Haversine formula.
     Returns distance in miles.
     """
-    if not all([lat1 is not None, lon1 is not None, lat2 is not None, lon2 is not None]):
+    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
         return float('inf')
     
-    # Radius of Earth in miles
-    R = 3959
-    
     try:
         # Convert latitude and longitude from degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [float(lat1), float(lon1), float(lat2), float(lon2)])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
-    except ValueError:
+        lat1 = float(lat1) * _DEG_TO_RAD
+        lat2 = float(lat2) * _DEG_TO_RAD
+        dlon = (float(lon2) - float(lon1)) * _DEG_TO_RAD
+    except (TypeError, ValueError):
         return float('inf')
 
+    # Haversine formula
+    sin_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_dlon = math.sin(dlon * 0.5)
+    a = sin_dlat * sin_dlat + math.cos(lat1) * math.cos(lat2) * sin_dlon * sin_dlon
+    return _EARTH_RADIUS_MILES * 2 * math.asin(math.sqrt(a))
+
 # ── Geocoding ─────────────────────────────────────────────────────────────────
 # Uses Nominatim (OpenStreetMap) via plain HTTP requests with:
 #   • Fast-path lookup table for common test addresses (no I/O)
 #   • In-process cache (up to 2000 entries; evicts oldest when full)
+#   • Shared S3 record per normalised address, so workers and restarts reuse
+#     each other's lookups instead of queueing on the Nominatim rate limit
 #   • 1.1 s rate-limit gate between Nominatim requests (ToS requirement)
 #   • Returns (None, None) on failure so callers skip distance filtering
 #     rather than silently collapsing every unknown address to one point.
@@ -204,6 +239,15 @@ _GEOCODE_LOCK = threading.Lock()
 _GEOCODE_LAST_REQ: float = 0.0
 _NOMINATIM_MIN_INTERVAL = 1.1   # seconds between requests
 _GEOCODE_CACHE_MAX = 2000
+# Shared S3 geocode records: places don't move, but "not found" may be fixed upstream
+_GEOCODE_HIT_TTL = 30 * 86400
+_GEOCODE_MISS_TTL = 86400
+# Lookups are serialised by _GEOCODE_LOCK, so one kept-alive connection is
+# enough and saves a TLS handshake on every cache miss.
+_NOMINATIM_SESSION = requests.Session()
+_NOMINATIM_SESSION.headers.update({
+    "User-Agent": "TheServicesExchange/1.0 contact@theservicesexchange.com",
+})
 
 # Hardcoded fast-path for addresses that appear frequently in tests/examples.
 _KNOWN_COORDS: Dict[str, Tuple[float, float]] = {
@@ -215,6 +259,15 @@ _KNOWN_COORDS: Dict[str, Tuple[float, float]] = {
     "denver, co":                    (39.7392, -104.9903),
     "colorado":                      (39.5501, -105.7821),
 }
+# Partial-match fallback, most specific (longest) key first so the first hit wins
+_KNOWN_COORDS_BY_LENGTH: List[Tuple[str, Tuple[float, float]]] = sorted(
+    _KNOWN_COORDS.items(), key=lambda kv: -len(kv[0])
+)
+
+
+def _normalize_address(address: str) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(address.lower().split())
 
 
 def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
@@ -224,7 +277,8 @@ def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
     Resolution order:
       1. Hardcoded fast-path table  (instant)
       2. In-process cache           (instant)
-      3. Nominatim / OpenStreetMap  (HTTP, rate-limited to 1 req/sec, free)
+      3. Shared S3 geocode record   (one GET, any worker's earlier lookup)
+      4. Nominatim / OpenStreetMap  (HTTP, rate-limited to 1 req/sec, free)
 
     Returns (None, None) when geocoding fails.  Callers that receive None
     coords should skip distance filtering (fail-open) rather than treating
@@ -235,10 +289,13 @@ def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
     if not address:
         return None, None
 
-    key = address.lower().strip()
+    key = _normalize_address(address)
 
-    # 1. Hardcoded fast path
-    for known_key, coords in _KNOWN_COORDS.items():
+    # 1. Hardcoded fast path: exact hit, else partial match
+    coords = _KNOWN_COORDS.get(key)
+    if coords is not None:
+        return coords
+    for known_key, coords in _KNOWN_COORDS_BY_LENGTH:
         if known_key in key or key in known_key:
             return coords
 
@@ -246,7 +303,16 @@ def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
     if key in _GEOCODE_CACHE:
         return _GEOCODE_CACHE[key]
 
-    # 3. Nominatim HTTP request (serialised by lock to respect rate limit)
+    # 3. Shared S3 record — resolved earlier by any worker or process
+    record = get_geocode_record(key)
+    if record is not None:
+        ttl = _GEOCODE_HIT_TTL if record.get('lat') is not None else _GEOCODE_MISS_TTL
+        if time.time() - record.get('resolved_at', 0) < ttl:
+            result = (record.get('lat'), record.get('lon'))
+            _remember_geocode(key, result)
+            return result
+
+    # 4. Nominatim HTTP request (serialised by lock to respect rate limit)
     with _GEOCODE_LOCK:
         if key in _GEOCODE_CACHE:          # double-checked
             return _GEOCODE_CACHE[key]
@@ -256,54 +322,118 @@ def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
             time.sleep(wait)
 
         result: Tuple[Optional[float], Optional[float]] = (None, None)
+        definitive = False
         try:
-            resp = requests.get(
+            resp = _NOMINATIM_SESSION.get(
                 "https://nominatim.openstreetmap.org/search",
                 params={"q": address, "format": "json", "limit": 1},
-                headers={"User-Agent": "TheServicesExchange/1.0 contact@theservicesexchange.com"},
                 timeout=5,
             )
             _GEOCODE_LAST_REQ = time.time()
             if resp.status_code == 200:
                 hits = resp.json()
+                definitive = True
                 if hits:
                     result = (float(hits[0]["lat"]), float(hits[0]["lon"]))
-                    logger.info(f"Geocoded '{address}' → {result}")
+                    logger.info("Geocoded '%s' → %s", address, result)
                 else:
-                    logger.info(f"Nominatim: no results for '{address}'")
+                    logger.info("Nominatim: no results for '%s'", address)
             else:
-                logger.warning(f"Nominatim returned HTTP {resp.status_code} for '{address}'")
+                logger.warning("Nominatim returned HTTP %s for '%s'", resp.status_code, address)
         except Exception as exc:
             _GEOCODE_LAST_REQ = time.time()
-            logger.warning(f"Geocoding error for '{address}': {exc}")
+            logger.warning("Geocoding error for '%s': %s", address, exc)
 
-        # Evict oldest entry when cache is at capacity
-        if len(_GEOCODE_CACHE) >= _GEOCODE_CACHE_MAX:
-            try:
-                _GEOCODE_CACHE.pop(next(iter(_GEOCODE_CACHE)))
-            except StopIteration:
-                pass
+        _remember_geocode(key, result)
 
-        _GEOCODE_CACHE[key] = result
-        return result
+    # Share real answers (including "no such place"), never transient failures
+    if definitive:
+        save_geocode_record(key, *result)
+    return result
+
+
+def _remember_geocode(key: str, result: Tuple[Optional[float], Optional[float]]) -> None:
+    """Store in the in-process cache, evicting the oldest entry when full."""
+    if key not in _GEOCODE_CACHE and len(_GEOCODE_CACHE) >= _GEOCODE_CACHE_MAX:
+        try:
+            _GEOCODE_CACHE.pop(next(iter(_GEOCODE_CACHE)))
+        except (StopIteration, KeyError, RuntimeError):
+            pass
+    _GEOCODE_CACHE[key] = result
 
 
 # Keep old name as an alias so any remaining call sites still work
 def simple_geocode(address: str) -> Tuple[Optional[float], Optional[float]]:
     return geocode_address(address)
 
+# Shared keep-alive session for OpenRouter: grab_job can issue many LLM calls
+# per request, and a bare requests.post pays a TCP+TLS handshake each time.
+# Retries cover transient transport/5xx failures only — 429 and friends are
+# handled by the model fallback tiers in call_openrouter_llm. Read timeouts
+# are not retried: the caller's timeout is the budget, and matching falls
+# back to keywords rather than waiting it out again.
+_OPENROUTER_SESSION = requests.Session()
+_OPENROUTER_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=2,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(500, 504),
+        allowed_methods=frozenset({'POST'}),
+        raise_on_status=False,
+    ),
+))
+_OPENROUTER_SESSION.headers.update({
+    "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
+    "Content-Type": "application/json",
+    "HTTP-Referer": "https://theservicesexchange.com",
+    "X-Title": "The Services Exchange"
+})
+
+# Fan-out pool for per-service LLM calls (network-bound, so threads suffice)
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='llm-match')
+# Overlaps independent storage scans within one request (boto3 clients are thread-safe)
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='s3-fetch')
+
+# Chat/bulletin writes can be handed to _IO_EXECUTOR so the request returns
+# without waiting on S3. Off by default: a write queued when a worker dies
+# is lost, and a read racing the write may not see it yet. Pending writes
+# are flushed on normal interpreter shutdown.
+_WRITE_BEHIND_ENABLED = bool(getattr(config, 'WRITE_BEHIND_FEED_WRITES', False))
+
+
+def _log_write_behind_failure(future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Write-behind storage write failed: %s", exc)
+
+
+def _write_behind(write, *args) -> None:
+    """Run a fire-and-forget storage write on the I/O pool if enabled, else inline."""
+    if _WRITE_BEHIND_ENABLED:
+        _IO_EXECUTOR.submit(write, *args).add_done_callback(_log_write_behind_failure)
+    else:
+        write(*args)
+
 def call_openrouter_llm(
     prompt: str,
     temperature: float = 0,
     max_tokens: int = 20,
     fallback_level: int = 0,
     timeout: float = 15,
+    stop_when: Optional[Callable[[str], bool]] = None,
 ) -> Optional[str]:
     """
     Call OpenRouter API with 3-tier fallback on rate limiting:
       0 → OPENROUTER_MODEL            (best free model)
       1 → OPENROUTER_FALLBACK_FREE_MODEL (smaller free model)
       2 → OPENROUTER_FALLBACK_MODEL   (paid model)
+
+    With stop_when, the completion is streamed and the connection is closed
+    as soon as stop_when(text_so_far) is true, so short verdicts return
+    without waiting for the rest of the generation.
     """
     _models = [
         config.OPENROUTER_MODEL,
@@ -322,28 +452,25 @@ def call_openrouter_llm(
     model = _models[fallback_level]
 
     try:
-        headers = {
-            "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://theservicesexchange.com",
-            "X-Title": "The Services Exchange"
-        }
-
         data = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": temperature,
             "max_tokens": max_tokens
         }
+        if stop_when is not None:
+            data["stream"] = True
 
-        response = requests.post(
+        response = _OPENROUTER_SESSION.post(
             config.OPENROUTER_API_URL,
-            headers=headers,
             json=data,
-            timeout=timeout
+            timeout=timeout,
+            stream=stop_when is not None,
         )
 
         if response.status_code == 200:
+            if stop_when is not None:
+                return _read_openrouter_stream(response, stop_when)
             result = response.json()
             if 'choices' in result and len(result['choices']) > 0:
                 return result['choices'][0]['message']['content'].strip()
@@ -361,20 +488,44 @@ def call_openrouter_llm(
         if should_fallback and fallback_level + 1 < len(_models):
             next_model = _models[fallback_level + 1]
             logger.warning(
-                f"OpenRouter error on {model} (HTTP {response.status_code}, tier {fallback_level}); "
-                f"falling back to {next_model}"
+                "OpenRouter error on %s (HTTP %s, tier %s); falling back to %s",
+                model, response.status_code, fallback_level, next_model,
             )
-            return call_openrouter_llm(prompt, temperature, max_tokens, fallback_level + 1, timeout)
+            return call_openrouter_llm(prompt, temperature, max_tokens, fallback_level + 1, timeout, stop_when)
 
-        logger.error(f"OpenRouter API error on {model}: {response.status_code} - {response.text[:200]}")
+        logger.error("OpenRouter API error on %s: %s - %s", model, response.status_code, response.text[:200])
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"OpenRouter request error (tier {fallback_level}, {model}): {str(e)}")
+        logger.error("OpenRouter request error (tier %s, %s): %s", fallback_level, model, e)
     except Exception as e:
-        logger.error(f"Unexpected error calling OpenRouter (tier {fallback_level}): {str(e)}")
+        logger.error("Unexpected error calling OpenRouter (tier %s): %s", fallback_level, e)
 
     return None
 
+def _read_openrouter_stream(response: requests.Response, stop_when: Callable[[str], bool]) -> str:
+    """Accumulate streamed delta text (SSE), stopping once stop_when(text) holds."""
+    parts: List[str] = []
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            # Skip keep-alive blanks and ": OPENROUTER PROCESSING" comments
+            if not line or not line.startswith('data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == '[DONE]':
+                break
+            try:
+                chunk = json.loads(payload)
+            except ValueError:
+                continue
+            choices = chunk.get('choices') or []
+            if choices:
+                parts.append((choices[0].get('delta') or {}).get('content') or '')
+                if stop_when(''.join(parts)):
+                    break
+    finally:
+        response.close()
+    return ''.join(parts).strip()
+
 def _heuristic_parse_service(description: str) -> Dict[str, Any]:
     """Fast offline defaults when LLM is unavailable."""
     text = (description or '').strip()
@@ -512,18 +663,114 @@ JSON only:"""
             'source': 'llm',
         }, 200
     except Exception as e:
-        logger.warning(f"parse_service_request LLM/parse failed: {e}")
+        logger.warning("parse_service_request LLM/parse failed: %s", e)
         return base, 200
 
 
+_MATCH_RULES = """RULES:
+- Answer YES if the provider's skills, equipment, or credentials reasonably cover this service.
+- Be lenient: if there is a plausible chance the provider can do the job, answer YES.
+- Answer NO only when the service clearly requires a completely different domain of expertise or equipment.
+  Examples that must be NO: a landscaper doing post-surgery nursing; a nurse erecting steel frames;
+  a food delivery driver performing a cybersecurity audit; a party entertainer doing EPA emissions testing.
+- Partial skill overlap is fine — lean toward YES when in doubt."""
+
+
+# Recent LLM verdicts keyed on (service text, capabilities). Bids repeat the
+# same service wording and providers re-grab with the same capabilities, so
+# identical questions are answered from memory. Keyword fallbacks are not
+# cached: they are cheap and only stand in while the LLM is unavailable.
+_MATCH_CACHE_TTL = int(getattr(config, 'MATCH_CACHE_TTL_SECONDS', 3600) or 3600)
+_MATCH_CACHE_MAX = 10_000
+_match_cache: "OrderedDict[Tuple[str, str], Tuple[float, bool]]" = OrderedDict()
+_match_cache_lock = threading.Lock()
+
+# Adaptive timeout for match calls: once enough answers have been timed,
+# wait ~1.5x the recent p90 instead of the full ceiling, so one stalled
+# model call falls back to keyword matching instead of holding grab_job.
+# Single and batch prompts are tracked apart (batch replies are longer).
+_MATCH_TIMEOUT_MAX = float(getattr(config, 'LLM_MATCH_TIMEOUT_SECONDS', 15) or 15)
+_MATCH_TIMEOUT_MIN = 2.0
+_MATCH_LATENCY_MIN_SAMPLES = 20
+_match_latency: Dict[str, "deque[float]"] = {'single': deque(maxlen=200), 'batch': deque(maxlen=200)}
+
+
+def _match_timeout(kind: str) -> float:
+    samples = sorted(_match_latency[kind])
+    if len(samples) < _MATCH_LATENCY_MIN_SAMPLES:
+        return _MATCH_TIMEOUT_MAX
+    p90 = samples[int(len(samples) * 0.9)]
+    return min(_MATCH_TIMEOUT_MAX, max(_MATCH_TIMEOUT_MIN, 1.5 * p90))
+
+
+def _call_match_llm(kind: str, prompt: str, **kwargs: Any) -> Optional[str]:
+    """call_openrouter_llm under the adaptive timeout, recording the latency.
+
+    Calls that hit the timeout are recorded at the timeout, so when the
+    provider slows down the p90 climbs and the timeout rises with it
+    instead of staying pinned to a window learned while it was fast.
+    """
+    timeout = _match_timeout(kind)
+    started = time.time()
+    answer = call_openrouter_llm(prompt, timeout=timeout, **kwargs)
+    elapsed = time.time() - started
+    if answer:
+        _match_latency[kind].append(elapsed)
+    elif elapsed >= timeout:
+        _match_latency[kind].append(timeout)
+    return answer
+
+
+def _service_text(service_description: Union[str, Dict]) -> str:
+    """Prompt/cache text for a service (dicts serialised with stable key order)."""
+    if isinstance(service_description, dict):
+        return json.dumps(service_description, sort_keys=True)
+    return str(service_description)
+
+
+def _match_cache_get(service_text: str, provider_capabilities: str,
+                     now: Optional[float] = None) -> Optional[bool]:
+    key = (service_text, provider_capabilities)
+    with _match_cache_lock:
+        entry = _match_cache.get(key)
+        if entry is None:
+            return None
+        if (time.time() if now is None else now) - entry[0] >= _MATCH_CACHE_TTL:
+            del _match_cache[key]
+            return None
+        _match_cache.move_to_end(key)
+        return entry[1]
+
+
+def _match_cache_set(service_text: str, provider_capabilities: str, verdict: bool) -> None:
+    key = (service_text, provider_capabilities)
+    with _match_cache_lock:
+        _match_cache[key] = (time.time(), verdict)
+        _match_cache.move_to_end(key)
+        while len(_match_cache) > _MATCH_CACHE_MAX:
+            _match_cache.popitem(last=False)
+
+
+# A whole-word verdict with something after it: a bare "NO" at the end of the
+# text so far may still be the start of "NOTE", and "NOT"/"KNOW"/"CANNOT"
+# must not cut the stream before the real answer.
+_VERDICT_RE = re.compile(r'\b(?:YES|NO)(?=\W)')
+
+
+def _has_verdict(text: str) -> bool:
+    return _VERDICT_RE.search(text.upper()) is not None
+
+
 def match_service_with_capabilities(service_description: Union[str, Dict], provider_capabilities: str) -> bool:
     """
     Use OpenRouter to determine if provider can fulfill service, with keyword fallback.
     """
     try:
         # Handle service objects
-        if isinstance(service_description, dict):
-            service_description = json.dumps(service_description)
+        service_description = _service_text(service_description)
+        cached = _match_cache_get(service_description, provider_capabilities)
+        if cached is not None:
+            return cached
         
         prompt = f"""You are a service marketplace matching engine. Decide whether a provider can fulfill a service request.
 
@@ -533,48 +780,146 @@ SERVICE REQUEST:
 PROVIDER CAPABILITIES:
 {provider_capabilities}
 
-RULES:
-- Answer YES if the provider's skills, equipment, or credentials reasonably cover this service.
-- Be lenient: if there is a plausible chance the provider can do the job, answer YES.
-- Answer NO only when the service clearly requires a completely different domain of expertise or equipment.
-  Examples that must be NO: a landscaper doing post-surgery nursing; a nurse erecting steel frames;
-  a food delivery driver performing a cybersecurity audit; a party entertainer doing EPA emissions testing.
-- Partial skill overlap is fine — lean toward YES when in doubt.
+{_MATCH_RULES}
 
 Respond with exactly one word: YES or NO.
 
 Answer:"""
 
-        answer = call_openrouter_llm(prompt, temperature=0, max_tokens=20)
+        answer = _call_match_llm('single', prompt, temperature=0, max_tokens=20, stop_when=_has_verdict)
         
         if answer:
             if "YES" in answer.upper():
+                _match_cache_set(service_description, provider_capabilities, True)
                 return True
             if "NO" in answer.upper():
+                _match_cache_set(service_description, provider_capabilities, False)
                 return False
         
     except Exception as e:
-        logger.error(f"LLM matching error: {str(e)}")
+        logger.error("LLM matching error: %s", e)
     
     # Fallback to keyword matching
     return keyword_match_service(service_description, provider_capabilities)
 
-def keyword_match_service(service_description: Union[str, Dict], provider_capabilities: str) -> bool:
-    """Fallback keyword matching."""
-    # Handle service objects
-    if isinstance(service_description, dict):
-        service_description = json.dumps(service_description)
-    
-    service_words = set(str(service_description).lower().split())
-    capability_words = set(provider_capabilities.lower().split())
-    common_words = service_words & capability_words
-    return len(common_words) >= 1  # More lenient for testing
+def _parse_batch_verdicts(answer: Optional[str], expected: int) -> Optional[List[bool]]:
+    """Parse a JSON array of YES/NO verdicts; None unless it has exactly `expected` entries."""
+    if not answer:
+        return None
+    start = answer.find('[')
+    end = answer.rfind(']')
+    if start < 0 or end <= start:
+        return None
+    try:
+        items = json.loads(answer[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    verdicts = []
+    for item in items:
+        if isinstance(item, bool):
+            verdicts.append(item)
+        elif isinstance(item, str) and item.strip().upper() in ('YES', 'NO'):
+            verdicts.append(item.strip().upper() == 'YES')
+        else:
+            return None
+    return verdicts
+
+
+def match_services_batch(services: List[Union[str, Dict]], provider_capabilities: str) -> List[bool]:
+    """
+    Match several services against one provider in a single OpenRouter call.
+
+    Returns one verdict per service, in order. Services with a cached
+    verdict are not sent to the model. If the model answers but the reply
+    cannot be parsed, the services are matched individually with the calls
+    issued concurrently; if the LLM is unavailable, keyword matching is used.
+    """
+    if not services:
+        return []
+
+    all_texts = [_service_text(s) for s in services]
+    now = time.time()
+    results = [_match_cache_get(text, provider_capabilities, now) for text in all_texts]
+    pending = [i for i, cached in enumerate(results) if cached is None]
+    if not pending:
+        return results
+
+    texts = [all_texts[i] for i in pending]
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+    prompt = f"""You are a service marketplace matching engine. For each numbered service request, decide whether the provider can fulfill it.
+
+SERVICE REQUESTS:
+{numbered}
+
+PROVIDER CAPABILITIES:
+{provider_capabilities}
+
+{_MATCH_RULES}
+
+Respond with only a JSON array of {len(texts)} strings, "YES" or "NO", one per service in the same order.
+
+Answer:"""
+
+    answer, verdicts = None, None
+    try:
+        # ~5 tokens per item covers '"YES",\n' and one-per-line replies; 16 for a ```json fence
+        answer = _call_match_llm('batch', prompt, temperature=0, max_tokens=16 + 5 * len(texts))
+        verdicts = _parse_batch_verdicts(answer, len(texts))
+        if verdicts is not None:
+            for text, verdict in zip(texts, verdicts):
+                _match_cache_set(text, provider_capabilities, verdict)
+        elif answer:
+            logger.warning("Unparseable batch match reply for %s services", len(texts))
+            verdicts = list(_LLM_EXECUTOR.map(
+                lambda text: match_service_with_capabilities(text, provider_capabilities),
+                texts,
+            ))
+    except Exception as e:
+        logger.error("LLM batch matching error: %s", e)
+
+    if verdicts is None:
+        capability_words = _keyword_set(provider_capabilities)
+        verdicts = [keyword_match_service(text, provider_capabilities, capability_words) for text in texts]
+    for i, verdict in zip(pending, verdicts):
+        results[i] = verdict
+    return results
+
+
+def keyword_match_service(
+    service_description: Union[str, Dict],
+    provider_capabilities: str,
+    capability_words: Optional[frozenset] = None,
+) -> bool:
+    """Fallback keyword matching.
+
+    Callers matching many services against one provider can pass the
+    provider's lowercased ``capability_words`` once instead of re-splitting.
+    """
+    if capability_words is None:
+        capability_words = _keyword_set(provider_capabilities)
+    # Any shared word is a match (lenient for testing)
+    return not capability_words.isdisjoint(_keyword_set(_service_text(service_description)))
+
+
+@lru_cache(maxsize=4096)
+def _keyword_set(text: str) -> frozenset:
+    """Lowercased word set; bids keep their service text, so rescans hit the cache."""
+    return frozenset(text.lower().split())
 
 def calculate_reputation_score(user_data: Dict[str, Any]) -> float:
     """Calculate user reputation score (0.0 - 5.0)."""
-    stars = user_data.get('stars', 0)
-    total_ratings = user_data.get('total_ratings', 0)
-    
+    return _reputation_from_counts(user_data.get('stars', 0), user_data.get('total_ratings', 0))
+
+
+@lru_cache(maxsize=4096)
+def _reputation_from_counts(stars: float, total_ratings: int) -> float:
+    """Reputation for a (stars, total_ratings) pair.
+
+    Keyed on the rating counters themselves, so a save_account that changes
+    them simply misses the cache; nothing needs invalidating.
+    """
     if total_ratings == 0:
         return 2.5
     
@@ -610,7 +955,7 @@ def register_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         
         user_data = {
             'username': username,
-            'password': generate_password_hash(password),
+            'password': generate_password_hash(password, method=_PASSWORD_HASH_METHOD),
             'user_type': user_type,
             'created_on': int(time.time()),
             'stars': 0,
@@ -623,12 +968,12 @@ def register_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
               actor={'username': username, 'user_type': user_type, 'public_id': username, 'handle': username},
               payload={'user_type': user_type},
               idempotency_key=f"account.registered:{username}")
-        logger.info(f"User registered: {username} (type: {user_type})")
+        logger.info("User registered: %s (type: %s)", username, user_type)
         
         return {"message": "Registration successful"}, 201
         
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
+        logger.error("Registration error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def login_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -646,12 +991,22 @@ def login_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         
         if not check_password_hash(user_data['password'], password):
             return {"error": "Invalid credentials"}, 401
+
+        # Upgrade hashes made with an older/costlier method while we hold the
+        # plaintext, so later logins verify at the configured cost.
+        # Re-read so the save doesn't overwrite other fields with a cached copy.
+        if user_data['password'].split('$', 1)[0] != _password_hash_prefix():
+            fresh = get_account(username, force_refresh=True)
+            if fresh and fresh.get('password') == user_data['password']:
+                fresh['password'] = generate_password_hash(password, method=_PASSWORD_HASH_METHOD)
+                save_account(username, fresh)
+                logger.info("Rehashed password for %s", username)
         
         token = str(uuid.uuid4())
         expiry_time = int(time.time()) + config.TOKEN_EXPIRY_SECONDS
         save_token(token, username, expiry_time)
         
-        logger.info(f"User logged in: {username}")
+        logger.info("User logged in: %s", username)
         return {
             "access_token": token,
             "username": username,
@@ -659,7 +1014,7 @@ def login_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
         
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def get_account_info(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -725,7 +1080,7 @@ def get_account_info(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
 
     except Exception as e:
-        logger.error(f"Account error: {str(e)}")
+        logger.error("Account error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -776,13 +1131,13 @@ def set_phantom_wallet(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             payload={'phantom_wallet_address': address},
             idempotency_key=f"phantom.linked:{username}:{address}",
         )
-        logger.info(f"Phantom wallet linked for {username}: {address}")
+        logger.info("Phantom wallet linked for %s: %s", username, address)
         return {
             "message": "Phantom wallet linked",
             "phantom_wallet_address": address,
         }, 200
     except Exception as e:
-        logger.error(f"set_phantom_wallet error: {str(e)}")
+        logger.error("set_phantom_wallet error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -798,7 +1153,7 @@ def clear_phantom_wallet(username: str) -> Tuple[Dict[str, Any], int]:
         save_account(username, user_data)
         return {"message": "Phantom wallet unlinked"}, 200
     except Exception as e:
-        logger.error(f"clear_phantom_wallet error: {str(e)}")
+        logger.error("clear_phantom_wallet error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -840,7 +1195,7 @@ def set_wallet(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
               payload={'wallet_address': address, 'seat_status': seat_status},
               idempotency_key=f"wallet.linked:{username}:{address}")
 
-        logger.info(f"Wallet linked for {username}: {address}")
+        logger.info("Wallet linked for %s: %s", username, address)
         return {
             "message": "Wallet address linked",
             "wallet_address": address,
@@ -850,7 +1205,7 @@ def set_wallet(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
 
     except Exception as e:
-        logger.error(f"Set wallet error: {str(e)}")
+        logger.error("Set wallet error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -988,7 +1343,7 @@ def get_profile(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'contact_hash_count': len(user_data.get('contact_hashes') or []),
         }, 200
     except Exception as e:
-        logger.error(f"Get profile error: {str(e)}")
+        logger.error("Get profile error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1026,7 +1381,7 @@ def update_profile(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         save_account(username, user_data)
         return {"message": "Profile updated"}, 200
     except Exception as e:
-        logger.error(f"Update profile error: {str(e)}")
+        logger.error("Update profile error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1047,7 +1402,7 @@ def get_or_create_profile_slug(data: Dict[str, Any]) -> Tuple[Dict[str, Any], in
 
         return {"profile_slug": slug}, 200
     except Exception as e:
-        logger.error(f"Get share link error: {str(e)}")
+        logger.error("Get share link error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1091,7 +1446,7 @@ def get_public_profile(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'privacy_level': plvl,
         }, 200
     except Exception as e:
-        logger.error(f"Get public profile error: {str(e)}")
+        logger.error("Get public profile error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1135,7 +1490,7 @@ def upload_avatar(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"avatar_url": avatar_url}, 200
     except Exception as e:
-        logger.error(f"Upload avatar error: {str(e)}")
+        logger.error("Upload avatar error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -1168,7 +1523,7 @@ def follow_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"message": f"Now following {followee}"}, 200
     except Exception as e:
-        logger.error(f"Follow user error: {str(e)}")
+        logger.error("Follow user error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1192,7 +1547,7 @@ def unfollow_user(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"message": f"Unfollowed {followee}"}, 200
     except Exception as e:
-        logger.error(f"Unfollow user error: {str(e)}")
+        logger.error("Unfollow user error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1203,7 +1558,7 @@ def get_follow_lists(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         follows = get_follows(username)
         return {"following": follows['following'], "followers": follows['followers']}, 200
     except Exception as e:
-        logger.error(f"Get follow lists error: {str(e)}")
+        logger.error("Get follow lists error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -1216,7 +1571,7 @@ def get_request_history(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         username = data.get('username')
         return {"bids": get_user_bids(username), "jobs": get_user_jobs(username)}, 200
     except Exception as e:
-        logger.error(f"Get request history error: {str(e)}")
+        logger.error("Get request history error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -1250,7 +1605,7 @@ def add_robot_owned(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"robot": robot}, 201
     except Exception as e:
-        logger.error(f"Add robot owned error: {str(e)}")
+        logger.error("Add robot owned error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1271,7 +1626,7 @@ def remove_robot_owned(username: str, robot_id: str) -> Tuple[Dict[str, Any], in
 
         return {"message": "Robot removed"}, 200
     except Exception as e:
-        logger.error(f"Remove robot owned error: {str(e)}")
+        logger.error("Remove robot owned error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -1309,7 +1664,7 @@ def create_subscription(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"subscription": subscription}, 201
     except Exception as e:
-        logger.error(f"Create subscription error: {str(e)}")
+        logger.error("Create subscription error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1330,7 +1685,7 @@ def cancel_subscription(username: str, subscription_id: str) -> Tuple[Dict[str,
 
         return {"subscription": target}, 200
     except Exception as e:
-        logger.error(f"Cancel subscription error: {str(e)}")
+        logger.error("Cancel subscription error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1370,7 +1725,7 @@ def list_auto_bids(username: str) -> Tuple[Dict[str, Any], int]:
             "limits": {"max_active": _AUTO_BID_MAX_ACTIVE, "cadences": list(_AUTO_BID_CADENCES)},
         }, 200
     except Exception as e:
-        logger.error(f"List auto_bids error: {str(e)}")
+        logger.error("List auto_bids error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1483,7 +1838,7 @@ def create_auto_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         save_account(username, user_data)
         return {"auto_bid": item}, 201
     except Exception as e:
-        logger.error(f"Create auto_bid error: {str(e)}")
+        logger.error("Create auto_bid error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1528,7 +1883,7 @@ def update_auto_bid(username: str, auto_bid_id: str, data: Dict[str, Any]) -> Tu
         save_account(username, user_data)
         return {"auto_bid": target}, 200
     except Exception as e:
-        logger.error(f"Update auto_bid error: {str(e)}")
+        logger.error("Update auto_bid error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1633,7 +1988,7 @@ def process_auto_bids_for_user(username: str) -> Tuple[Dict[str, Any], int]:
         save_account(username, user_data)
         return {"posted": posted, "skipped": skipped, "auto_bids": auto_bids}, 200
     except Exception as e:
-        logger.error(f"Process auto_bids error: {str(e)}")
+        logger.error("Process auto_bids error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1746,7 +2101,7 @@ def set_contact_discovery(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             ),
         }, 200
     except Exception as e:
-        logger.error(f"set_contact_discovery error: {str(e)}")
+        logger.error("set_contact_discovery error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1761,7 +2116,7 @@ def get_contact_discovery(username: str) -> Tuple[Dict[str, Any], int]:
             "registered_identifiers": len(user_data.get('contact_hashes') or []),
         }, 200
     except Exception as e:
-        logger.error(f"get_contact_discovery error: {str(e)}")
+        logger.error("get_contact_discovery error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1811,7 +2166,7 @@ def match_contacts(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             "match_count": len(matches),
         }, 200
     except Exception as e:
-        logger.error(f"match_contacts error: {str(e)}")
+        logger.error("match_contacts error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1918,7 +2273,7 @@ def handle_purchase_cosmetic(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]
 
         return order, 201
     except Exception as e:
-        logger.error(f"Purchase cosmetic error: {str(e)}")
+        logger.error("Purchase cosmetic error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1946,7 +2301,7 @@ def equip_cosmetic(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"cosmetics_equipped": user_data['cosmetics_equipped']}, 200
     except Exception as e:
-        logger.error(f"Equip cosmetic error: {str(e)}")
+        logger.error("Equip cosmetic error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -1975,7 +2330,7 @@ def admin_adjust_credits(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"username": username, "credits": user_data['credits']}, 200
     except Exception as e:
-        logger.error(f"Admin adjust credits error: {str(e)}")
+        logger.error("Admin adjust credits error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def get_my_bids(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2004,12 +2359,12 @@ def get_my_bids(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                 })
         
         # Sort by newest first
-        outstanding_bids.sort(key=lambda x: x['created_at'], reverse=True)
+        outstanding_bids.sort(key=itemgetter('created_at'), reverse=True)
         
         return {"bids": outstanding_bids}, 200
         
     except Exception as e:
-        logger.error(f"Get my bids error: {str(e)}")
+        logger.error("Get my bids error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def _job_info_for_user(job: Dict[str, Any], username: str) -> Dict[str, Any]:
@@ -2078,25 +2433,31 @@ def get_my_jobs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             elif _user_on_job_party(username, j, accepted_only=True):
                 user_jobs.append(j)
 
-        completed_jobs = []
+        completed = []
         active_jobs = []
-        rejected_jobs = []
+        rejected = []
 
         for job in user_jobs:
-            job_info = _job_info_for_user(job, username)
             if job['status'] == 'completed':
-                job_info['completed_at'] = job.get('completed_at')
-                completed_jobs.append(job_info)
+                completed.append(job)
             elif job['status'] == 'rejected':
-                job_info['rejected_at'] = job.get('rejected_at')
-                rejected_jobs.append(job_info)
+                rejected.append(job)
             elif job['status'] == 'accepted':
-                active_jobs.append(job_info)
+                active_jobs.append(_job_info_for_user(job, username))
         
-        # Sort by time (newest first)
-        completed_jobs.sort(key=lambda x: x.get('completed_at', 0), reverse=True)
-        active_jobs.sort(key=lambda x: x['accepted_at'], reverse=True)
-        rejected_jobs.sort(key=lambda x: x.get('rejected_at', 0), reverse=True)
+        # Newest first. Only the last 10 completed/rejected jobs are returned,
+        # so pick those before building their entries.
+        active_jobs.sort(key=itemgetter('accepted_at'), reverse=True)
+        completed_jobs = []
+        for job in heapq.nlargest(10, completed, key=lambda j: j.get('completed_at')):
+            job_info = _job_info_for_user(job, username)
+            job_info['completed_at'] = job.get('completed_at')
+            completed_jobs.append(job_info)
+        rejected_jobs = []
+        for job in heapq.nlargest(10, rejected, key=lambda j: j.get('rejected_at')):
+            job_info = _job_info_for_user(job, username)
+            job_info['rejected_at'] = job.get('rejected_at')
+            rejected_jobs.append(job_info)
 
         # Jobs where this user was invited as party member (supply or demand)
         # but is not primary buyer/provider.
@@ -2132,14 +2493,14 @@ def get_my_jobs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         party_invites.sort(key=lambda x: x['job_status'] != 'accepted')
 
         return {
-            "completed_jobs": completed_jobs[:10],  # Limit to last 10
+            "completed_jobs": completed_jobs,
             "active_jobs": active_jobs,
-            "rejected_jobs": rejected_jobs[:10],
+            "rejected_jobs": rejected_jobs,
             "party_invites": party_invites,
         }, 200
 
     except Exception as e:
-        logger.error(f"Get my jobs error: {str(e)}")
+        logger.error("Get my jobs error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def submit_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2184,7 +2545,7 @@ def submit_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             # For ridesharing, the primary location is the pickup point
             lat, lon = start_lat, start_lon
             address = start_address
-            logger.info(f"Ridesharing bid: {start_address} -> {end_address}")
+            logger.info("Ridesharing bid: %s -> %s", start_address, end_address)
         elif location_type in ['physical', 'hybrid']:
             # Traditional physical service with single location
             if 'lat' in data and 'lon' in data:
@@ -2246,12 +2607,12 @@ def submit_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         _emit('bid.posted', username=username, actor=public_actor(username),
               payload={'bid_id': bid_id, 'price': price, 'currency': currency},
               idempotency_key=f"bid.posted:{bid_id}")
-        logger.info(f"Bid created: {bid_id}")
+        logger.info("Bid created: %s", bid_id)
         
         return {"bid_id": bid_id}, 200
         
     except Exception as e:
-        logger.error(f"Bid error: {str(e)}")
+        logger.error("Bid error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def cancel_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2285,12 +2646,12 @@ def cancel_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         _emit('bid.cancelled', username=username, actor=public_actor(username),
               payload={'bid_id': bid_id},
               idempotency_key=f"bid.cancelled:{bid_id}")
-        logger.info(f"Bid cancelled: {bid_id}")
+        logger.info("Bid cancelled: %s", bid_id)
         
         return {"message": "Bid cancelled"}, 200
         
     except Exception as e:
-        logger.error(f"Cancel error: {str(e)}")
+        logger.error("Cancel error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -2372,20 +2733,50 @@ def update_bid(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         _emit('bid.updated', username=username, actor=public_actor(username),
               payload={'bid_id': bid_id, 'price': price, 'currency': currency},
               idempotency_key=f"bid.updated:{bid_id}:{bid['updated_at']}")
-        logger.info(f"Bid updated: {bid_id}")
+        logger.info("Bid updated: %s", bid_id)
         return {"bid_id": bid_id, "message": "Bid updated"}, 200
     except Exception as e:
-        logger.error(f"Update bid error: {str(e)}")
+        logger.error("Update bid error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
+def _claim_bid(bid_id: str, username: str) -> Optional[Dict[str, Any]]:
+    """Take a bid off the market; returns the live bid, or None if already taken.
+
+    The conditional claim write is what makes this safe across gunicorn
+    workers: only the worker that creates the claim marker may build a job.
+    """
+    if not claim_bid(bid_id, username):
+        return None
+    bid = get_bid(bid_id, force_refresh=True)
+    if not bid:
+        return None
+    delete_bid(bid_id)
+    return bid
+
+
+def _rank_bids_for_provider(bids: List[Dict[str, Any]], provider_reputation: float) -> List[Dict[str, Any]]:
+    """
+    Order bids by reputation tier (0.5-wide bands of distance from the
+    provider's score, closest first), then price (highest first), then
+    exact reputation distance.
+    """
+    if not bids:
+        return []
+    rep_diff = np.abs(provider_reputation - np.fromiter(
+        (bid['buyer_reputation'] for bid in bids), dtype=np.float64, count=len(bids),
+    ))
+    tier = np.floor(rep_diff / 0.5).astype(np.int64)
+    price = np.fromiter((bid['price'] for bid in bids), dtype=np.float64, count=len(bids))
+    return [bids[i] for i in np.lexsort((rep_diff, -price, tier))]
+
+
 def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """
     Match provider with best job using prioritized matching algorithm:
     1. Location filtering
-    2. Capability matching (AI)
-    3. Reputation alignment
-    4. Price (Highest first)
+    2. Reputation alignment, then price (highest first)
+    3. Capability matching (AI), taking the first match in that order
     """
     try:
         username = data.get('username')
@@ -2402,8 +2793,9 @@ def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                 return {"error": f"No valid The RSE Seat NFT found for wallet {wallet}. Use /set_wallet to re-sync after acquiring a seat."}, 403
 
         _GRAB_COOLDOWN = int(getattr(config, 'GRAB_JOB_COOLDOWN_SECONDS', 900) or 900)
+        now = time.time()
         last_grab = user_data.get('last_grab_at', 0)
-        remaining = _GRAB_COOLDOWN - (time.time() - last_grab)
+        remaining = _GRAB_COOLDOWN - (now - last_grab)
         if remaining > 0:
             return {"error": f"Rate limit: wait {int(remaining)}s before next /grab_job"}, 429
 
@@ -2423,82 +2815,80 @@ def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         
         if location_type in ['physical', 'hybrid']:
             if 'lat' in data and 'lon' in data:
-                provider_lat = data['lat']
-                provider_lon = data['lon']
+                try:
+                    provider_lat = float(data['lat'])
+                    provider_lon = float(data['lon'])
+                except (TypeError, ValueError):
+                    return {"error": "lat and lon must be numbers"}, 400
             elif 'address' in data:
                 provider_lat, provider_lon = simple_geocode(data['address'])
             else:
                 return {"error": "Location required for physical services"}, 400
         
         all_bids = get_all_bids()
+
+        allowed_mask = _LOCATION_COMPAT.get(location_type, _LOCATION_ANY)
+        provider_on_site = _LOCATION_BITS.get(location_type, 0) & _LOCATION_ON_SITE
         
         # Step 1: Location filtering
         location_filtered = []
         for bid in all_bids:
-            if bid['end_time'] <= time.time():
-                continue
-
-            # Skip bids previously rejected by this provider
-            if username in bid.get('rejected_by', []):
+            if bid['end_time'] <= now:
                 continue
 
             # Filter by location type compatibility
-            if location_type == 'remote' and bid['location_type'] in ['physical', 'hybrid']:
+            bid_bits = _LOCATION_BITS.get(bid['location_type'], _LOCATION_ANY)
+            if not allowed_mask & bid_bits:
                 continue
-            if location_type == 'physical' and bid['location_type'] == 'remote':
+
+            # Skip bids previously rejected by this provider
+            if username in bid.get('rejected_by', []):
                 continue
             
-            # Check distance for physical services
-            if bid['location_type'] in ['physical', 'hybrid'] and location_type in ['physical', 'hybrid']:
-                if bid.get('lat') and bid.get('lon') and provider_lat and provider_lon:
-                    distance = calculate_distance(
-                        bid['lat'], bid['lon'],
-                        provider_lat, provider_lon
-                    )
-                    if distance > max_distance:
-                        continue
-            
             location_filtered.append(bid)
+
+        # Check distance for physical services — one vectorised pass over
+        # all candidates (trig only inside the max_distance bounding box);
+        # remote or unknown-type bids and bids without coordinates are NaN, never
+        # "too far".
+        if provider_on_site and provider_lat and provider_lon and location_filtered:
+            lats, lons = geo.coordinate_arrays(location_filtered)
+            remote = np.fromiter(
+                (not _LOCATION_BITS.get(bid['location_type'], 0) & _LOCATION_ON_SITE for bid in location_filtered),
+                dtype=bool, count=len(location_filtered),
+            )
+            lats[remote] = np.nan
+            distances = geo.distance_miles_within(provider_lat, provider_lon, lats, lons, max_distance)
+            too_far = distances > max_distance
+            location_filtered = [bid for bid, far in zip(location_filtered, too_far) if not far]
         
         if not location_filtered:
             return {"message": "No jobs in your area"}, 204
         
-        # Step 2: Capability matching using LLM
-        capability_matched = []
-        for bid in location_filtered:
-            if match_service_with_capabilities(bid['service'], capabilities):
-                capability_matched.append(bid)
-        
-        if not capability_matched:
+        # Steps 2-3: rank by reputation alignment and price first, then
+        # capability-match in ranked chunks. The first match in rank order
+        # is the best job, so later chunks are only matched if every bid
+        # before them was rejected or already claimed.
+        ranked = _rank_bids_for_provider(location_filtered, provider_reputation)
+        chunk_size = int(getattr(config, 'GRAB_JOB_MATCH_CHUNK', 8) or 8)
+        best_bid = None
+        for start in range(0, len(ranked), chunk_size):
+            chunk = ranked[start:start + chunk_size]
+            verdicts = match_services_batch([bid['service'] for bid in chunk], capabilities)
+            for candidate, ok in zip(chunk, verdicts):
+                # Build the job from the live copy the claim re-read, not
+                # the (up to 15 s stale) cached candidate
+                claimed = _claim_bid(candidate['bid_id'], username) if ok else None
+                if claimed:
+                    best_bid = claimed
+                    break
+            if best_bid is not None:
+                break
+        if best_bid is None:
             return {"message": "No matching jobs for your capabilities"}, 204
         
-        # Step 3: Sort by reputation alignment (smaller difference is better)
-        capability_matched.sort(key=lambda b: abs(provider_reputation - b['buyer_reputation']))
-        
-        # Step 4: Within same reputation tier, sort by price (highest first)
-        final_sorted = []
-        current_rep_diff = None
-        current_group = []
-        
-        for bid in capability_matched:
-            rep_diff = abs(provider_reputation - bid['buyer_reputation'])
-            if current_rep_diff is None or abs(rep_diff - current_rep_diff) < 0.5:
-                current_group.append(bid)
-                current_rep_diff = rep_diff
-            else:
-                current_group.sort(key=lambda b: b['price'], reverse=True)
-                final_sorted.extend(current_group)
-                current_group = [bid]
-                current_rep_diff = rep_diff
-        
-        if current_group:
-            current_group.sort(key=lambda b: b['price'], reverse=True)
-            final_sorted.extend(current_group)
-        
-        # Select the best job
-        best_bid = final_sorted[0]
-        
         job_id = str(uuid.uuid4())
+        accepted_at = int(time.time())
         job_record = {
             'job_id': job_id,
             'bid_id': best_bid['bid_id'],
@@ -2514,7 +2904,7 @@ def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'address': best_bid.get('address'),
             'buyer_username': best_bid['username'],
             'provider_username': username,
-            'accepted_at': int(time.time()),
+            'accepted_at': accepted_at,
             'buyer_reputation': best_bid['buyer_reputation'],
             'provider_reputation': provider_reputation,
             # Ridesharing fields (None for non-ridesharing jobs)
@@ -2530,10 +2920,14 @@ def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'provider_seat_token_id': user_data.get('seat_token_id'),
         }
         
-        save_job(job_id, job_record)
-        delete_bid(best_bid['bid_id'])
-
-        user_data['last_grab_at'] = int(time.time())
+        if not save_job(job_id, job_record):
+            # The claim already took the bid off the market; put the buyer's
+            # request back rather than lose it with the failed job write
+            save_bid(best_bid['bid_id'], best_bid)
+            release_bid_claim(best_bid['bid_id'])
+            return {"error": "Internal server error"}, 500
+
+        user_data['last_grab_at'] = accepted_at
         save_account(username, user_data)
 
         buyer = job_record.get('buyer_username')
@@ -2550,12 +2944,12 @@ def grab_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             system_payload={'price': job_record.get('price'), 'bid_id': best_bid['bid_id']},
         )
 
-        logger.info(f"Job matched: {job_id}")
+        logger.info("Job matched: %s", job_id)
 
         return job_record, 200
         
     except Exception as e:
-        logger.error(f"Job grab error: {str(e)}")
+        logger.error("Job grab error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def reject_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2578,13 +2972,14 @@ def reject_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         if job['status'] != 'accepted':
             return {"error": "Can only reject jobs in accepted state"}, 400
 
+        now = int(time.time())
         if job.get('campaign_id'):
             # Campaign-originated jobs have no bid to restore — return the
             # committed units to the campaign's pool instead.
             campaign = get_campaign(job['campaign_id'])
             if campaign:
                 campaign['units_remaining'] = campaign.get('units_remaining', 0) + job.get('campaign_units', 1)
-                if campaign['status'] == 'fulfilled' and campaign['end_time'] > time.time():
+                if campaign['status'] == 'fulfilled' and campaign['end_time'] > now:
                     campaign['status'] = 'open'
                 commitment = next(
                     (c for c in campaign.get('commitments', []) if c.get('commitment_id') == job.get('campaign_commitment_id')),
@@ -2608,7 +3003,7 @@ def reject_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                 'currency': job.get('currency', 'USD'),
                 'payment_method': job.get('payment_method', 'cash'),
                 'xmoney_account': job.get('xmoney_account'),
-                'end_time': int(time.time()) + 3600,  # Extend by 1 hour
+                'end_time': now + 3600,  # Extend by 1 hour
                 'location_type': job['location_type'],
                 'lat': job.get('lat'),
                 'lon': job.get('lon'),
@@ -2619,14 +3014,14 @@ def reject_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                 'start_lon': job.get('start_lon'),
                 'end_lat': job.get('end_lat'),
                 'end_lon': job.get('end_lon'),
-                'created_at': int(time.time()),
+                'created_at': now,
                 'buyer_reputation': job['buyer_reputation'],
                 'rejected_by': rejected_by
             }
             save_bid(bid_id, bid)
 
         job['status'] = 'rejected'
-        job['rejected_at'] = int(time.time())
+        job['rejected_at'] = now
         job['rejection_reason'] = reason
         save_job(job_id, job)
 
@@ -2643,12 +3038,12 @@ def reject_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
               related_usernames=[buyer] if buyer and buyer != username else None,
               idempotency_key=f"job.rejected:{job_id}")
 
-        logger.info(f"Job rejected: {job_id}")
+        logger.info("Job rejected: %s", job_id)
 
         return {"message": "Job rejected successfully"}, 200
         
     except Exception as e:
-        logger.error(f"Reject job error: {str(e)}")
+        logger.error("Reject job error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def sign_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2745,20 +3140,23 @@ def sign_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                   related_usernames=related,
                   idempotency_key=f"job.completed:{job_id}")
 
-        logger.info(f"Job signed: {job_id}")
+        logger.info("Job signed: %s", job_id)
         
         return {"message": "Job signed successfully"}, 200
         
     except Exception as e:
-        logger.error(f"Sign job error: {str(e)}")
+        logger.error("Sign job error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def nearby_services(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """Find nearby services. Public projections apply per-bid privacy levels."""
     try:
         if 'lat' in data and 'lon' in data:
-            user_lat = data['lat']
-            user_lon = data['lon']
+            try:
+                user_lat = float(data['lat'])
+                user_lon = float(data['lon'])
+            except (TypeError, ValueError):
+                return {"error": "lat and lon must be numbers"}, 400
         elif 'address' in data:
             user_lat, user_lon = simple_geocode(data['address'])
             if user_lat is None or user_lon is None:
@@ -2768,28 +3166,25 @@ def nearby_services(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         radius = data.get('radius', 10)
         
-        nearby_bids = []
-        all_bids = get_all_bids()
-        
-        for bid in all_bids:
-            if bid.get('location_type') == 'remote':
-                continue
-            if bid.get('end_time', 0) <= time.time():
-                continue
-            
-            if bid.get('lat') is not None and bid.get('lon') is not None:
-                distance = calculate_distance(
-                    user_lat, user_lon,
-                    bid['lat'], bid['lon']
-                )
-                
-                if distance <= radius:
-                    # Match on true coords; publish privacy-projected fields only
-                    nearby_bids.append(
-                        privacy_mod.project_nearby_service(bid, distance)
-                    )
-        
-        nearby_bids.sort(key=lambda x: x['distance'])
+        now = time.time()
+        candidates = [
+            bid for bid in get_all_bids()
+            if bid.get('location_type') != 'remote' and bid.get('end_time', 0) > now
+        ]
+        if not candidates:
+            nearby_bids = []
+        else:
+            # One vectorised distance pass, trig only inside the radius's
+            # bounding box; bids without coordinates are NaN and never match
+            lats, lons = geo.coordinate_arrays(candidates)
+            distances = geo.distance_miles_within(user_lat, user_lon, lats, lons, radius)
+            within = np.flatnonzero(distances <= radius)
+            within = within[np.argsort(distances[within], kind='stable')]
+            # Match on true coords; publish privacy-projected fields only
+            nearby_bids = [
+                privacy_mod.project_nearby_service(candidates[i], float(distances[i]))
+                for i in within
+            ]
         
         return {
             "services": nearby_bids,
@@ -2800,7 +3195,7 @@ def nearby_services(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
         
     except Exception as e:
-        logger.error(f"Nearby error: {str(e)}")
+        logger.error("Nearby error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def send_chat_message(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2831,8 +3226,9 @@ def send_chat_message(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'read': False
         }
         
-        save_message(f"{sender}_{message_id}", message_data)
-        save_message(f"{recipient}_{message_id}", message_data)
+        # One object per message: get_user_messages matches on sender or
+        # recipient and de-duplicates by message_id, so both parties see it
+        _write_behind(save_message, message_id, message_data)
         
         return {
             "message_id": message_id,
@@ -2840,7 +3236,7 @@ def send_chat_message(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
         
     except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
+        logger.error("Chat error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def post_bulletin(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -2868,7 +3264,7 @@ def post_bulletin(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'posted_at': int(time.time())
         }
         
-        save_bulletin(post_id, bulletin_data)
+        _write_behind(save_bulletin, post_id, bulletin_data)
         
         return {
             "post_id": post_id,
@@ -2876,9 +3272,32 @@ def post_bulletin(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }, 200
         
     except Exception as e:
-        logger.error(f"Bulletin error: {str(e)}")
+        logger.error("Bulletin error: %s", e)
         return {"error": "Internal server error"}, 500
 
+@lru_cache(maxsize=4096)
+def _lowercase_cached(text: str) -> str:
+    return text.lower()
+
+
+def _service_search_text(service: Union[str, Dict]) -> str:
+    """Lowercased service text the exchange category filter searches.
+
+    Bid and job service strings repeat across requests, so the lowercase
+    copy is memoised; dict services are serialised first as before.
+    """
+    if isinstance(service, dict):
+        service = json.dumps(service)
+    return _lowercase_cached(service)
+
+
+def _newest(records: List[Dict[str, Any]], limit: int, key: Callable) -> List[Dict[str, Any]]:
+    """sorted(records, key=key, reverse=True)[:limit], without the full sort when limit >= 0."""
+    if limit < 0:
+        return sorted(records, key=key, reverse=True)[:limit]
+    return heapq.nlargest(limit, records, key=key)
+
+
 def get_exchange_data(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """Get comprehensive exchange data for the dashboard."""
     try:
@@ -2886,104 +3305,115 @@ def get_exchange_data(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         location_filter = data.get('location')
         limit = min(data.get('limit', 50), 200)
         include_completed = data.get('include_completed', False)
+        category_needle = category_filter.lower() if category_filter else None
+        location_needle = location_filter.lower() if location_filter else None
         
+        # The job scan is independent of the bid scan; start it first so the
+        # two S3 listings overlap instead of running back to back
+        jobs_future = _IO_EXECUTOR.submit(get_all_jobs) if include_completed else None
         all_bids = get_all_bids()
         current_time = int(time.time())
         
-        active_bids = []
-        for bid in all_bids:
-            if bid['end_time'] > current_time:
-                # Filter
-                if category_filter:
-                    service_str = json.dumps(bid['service']) if isinstance(bid['service'], dict) else bid['service']
-                    if category_filter.lower() not in service_str.lower():
+        # Market statistics are accumulated in the same passes as the lists
+        total_active_bids = 0
+        total_completed_today = 0
+        
+        # Filtered records are collected in full (the stats count every live
+        # record, whatever the limit), then heapq picks the newest `limit`
+        # so only those are projected into response dicts
+        def _matching_bids():
+            nonlocal total_active_bids
+            for bid in all_bids:
+                if bid['end_time'] <= current_time:
+                    continue
+                total_active_bids += 1
+                # Filter on the scalar address first; the service payload
+                # may need serialising, so only survivors pay for it
+                if location_needle:
+                    if not bid.get('address') or location_needle not in bid['address'].lower():
                         continue
-                
-                if location_filter:
-                    if not bid.get('address') or location_filter.lower() not in bid['address'].lower():
+
+                if category_needle:
+                    if category_needle not in _service_search_text(bid['service']):
                         continue
 
-                active_bids.append({
-                    'bid_id': bid['bid_id'],
-                    'service': bid['service'],
-                    'price': bid['price'],
-                    'currency': bid.get('currency', 'USD'),
-                    'location': bid.get('address', 'Remote'),
-                    'address': bid.get('address'),
-                    'lat': bid.get('lat'),
-                    'lon': bid.get('lon'),
-                    'buyer_reputation': bid.get('buyer_reputation'),
-                    'posted_at': bid['created_at']
-                })
+                yield bid
         
-        active_bids.sort(key=lambda x: x['posted_at'], reverse=True)
-        active_bids = active_bids[:limit]
+        active_bids = [{
+            'bid_id': bid['bid_id'],
+            'service': bid['service'],
+            'price': bid['price'],
+            'currency': bid.get('currency', 'USD'),
+            'location': bid.get('address', 'Remote'),
+            'address': bid.get('address'),
+            'lat': bid.get('lat'),
+            'lon': bid.get('lon'),
+            'buyer_reputation': bid.get('buyer_reputation'),
+            'posted_at': bid['created_at']
+        } for bid in _newest(list(_matching_bids()), limit, itemgetter('created_at'))]
         
         result = {
             'active_bids': active_bids
         }
         
         if include_completed:
-            all_jobs = get_all_jobs()
-            completed_jobs = []
+            today_start = current_time - 86400
             
-            for job in all_jobs:
-                if job['status'] == 'completed':
-                    if category_filter:
-                        service_str = json.dumps(job['service']) if isinstance(job['service'], dict) else job['service']
-                        if category_filter.lower() not in service_str.lower():
+            def _matching_jobs():
+                nonlocal total_completed_today
+                for job in jobs_future.result():
+                    if job['status'] != 'completed':
+                        continue
+                    if job.get('completed_at', 0) > today_start:
+                        total_completed_today += 1
+                    if location_needle:
+                        if not job.get('address') or location_needle not in job['address'].lower():
                             continue
-                    
-                    if location_filter:
-                        if not job.get('address') or location_filter.lower() not in job['address'].lower():
+
+                    if category_needle:
+                        if category_needle not in _service_search_text(job['service']):
                             continue
-                    
-                    ratings = []
-                    if job.get('buyer_rating'): ratings.append(job['buyer_rating'])
-                    if job.get('provider_rating'): ratings.append(job['provider_rating'])
-                    avg_rating = sum(ratings) / len(ratings) if ratings else None
-                    
-                    completed_jobs.append({
-                        'job_id': job['job_id'],
-                        'service': job['service'],
-                        'price': job['price'],
-                        'currency': job.get('currency', 'USD'),
-                        'address': job.get('address'),
-                        'lat': job.get('lat'),
-                        'lon': job.get('lon'),
-                        'avg_rating': avg_rating,
-                        'completed_at': job.get('completed_at', job['accepted_at'])
-                    })
+
+                    yield job
             
-            completed_jobs.sort(key=lambda x: x['completed_at'], reverse=True)
-            completed_jobs = completed_jobs[:limit]
+            completed_jobs = []
+            for job in _newest(list(_matching_jobs()), limit,
+                               lambda j: j.get('completed_at', j['accepted_at'])):
+                ratings = []
+                if job.get('buyer_rating'): ratings.append(job['buyer_rating'])
+                if job.get('provider_rating'): ratings.append(job['provider_rating'])
+                avg_rating = sum(ratings) / len(ratings) if ratings else None
+                
+                completed_jobs.append({
+                    'job_id': job['job_id'],
+                    'service': job['service'],
+                    'price': job['price'],
+                    'currency': job.get('currency', 'USD'),
+                    'address': job.get('address'),
+                    'lat': job.get('lat'),
+                    'lon': job.get('lon'),
+                    'avg_rating': avg_rating,
+                    'completed_at': job.get('completed_at', job['accepted_at'])
+                })
             
             result['completed_jobs'] = completed_jobs
         
         # Market statistics
         market_stats = {
-            'total_active_bids': len([b for b in all_bids if b['end_time'] > current_time]),
-            'total_completed_today': 0
+            'total_active_bids': total_active_bids,
+            'total_completed_today': total_completed_today
         }
         
         if category_filter and active_bids:
             prices = [b['price'] for b in active_bids]
             market_stats[f'avg_price_{category_filter}'] = round(sum(prices) / len(prices), 2)
         
-        if include_completed:
-            today_start = int(time.time()) - 86400
-            all_jobs = get_all_jobs()
-            market_stats['total_completed_today'] = len([
-                j for j in all_jobs 
-                if j['status'] == 'completed' and j.get('completed_at', 0) > today_start
-            ])
-        
         result['market_stats'] = market_stats
         
         return result, 200
         
     except Exception as e:
-        logger.error(f"Exchange data error: {str(e)}")
+        logger.error("Exchange data error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def get_conversations(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -3025,7 +3455,7 @@ def get_conversations(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         
         return {"conversations": conv_list}, 200
     except Exception as e:
-        logger.error(f"Get conversations error: {str(e)}")
+        logger.error("Get conversations error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def get_chat_history(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -3054,7 +3484,7 @@ def get_chat_history(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         
         return {"messages": chat_messages}, 200
     except Exception as e:
-        logger.error(f"Get chat history error: {str(e)}")
+        logger.error("Get chat history error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def send_reply(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -3077,7 +3507,7 @@ def get_bulletin_feed(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             })
         return {"posts": posts}, 200
     except Exception as e:
-        logger.error(f"Get bulletin feed error: {str(e)}")
+        logger.error("Get bulletin feed error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def get_platform_stats() -> Tuple[Dict[str, Any], int]:
@@ -3099,7 +3529,7 @@ def get_platform_stats() -> Tuple[Dict[str, Any], int]:
             'completed_jobs': completed_jobs
         }, 200
     except Exception as e:
-        logger.error(f"Get platform stats error: {str(e)}")
+        logger.error("Get platform stats error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def handle_get_feedback() -> Tuple[Dict[str, Any], int]:
@@ -3108,7 +3538,7 @@ def handle_get_feedback() -> Tuple[Dict[str, Any], int]:
         posts = get_feedback()
         return {"posts": posts}, 200
     except Exception as e:
-        logger.error(f"Get feedback error: {str(e)}")
+        logger.error("Get feedback error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def handle_post_feedback(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -3130,7 +3560,7 @@ def handle_post_feedback(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         save_feedback(posts[:500])
         return {"post": post}, 201
     except Exception as e:
-        logger.error(f"Post feedback error: {str(e)}")
+        logger.error("Post feedback error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -3233,7 +3663,7 @@ def handle_submit_financing(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         applications = get_financing_applications()
         applications.insert(0, application)
         save_financing_applications(applications[:2000])
-        logger.info(f"Financing application {application['application_id']} for {robot_model} (${loan_amount:,.0f}, {len(partner_ids)} partners)")
+        logger.info("Financing application %s for %s ($%s, %s partners)", application['application_id'], robot_model, format(loan_amount, ',.0f'), len(partner_ids))
 
         return {
             "application_id": application['application_id'],
@@ -3241,7 +3671,7 @@ def handle_submit_financing(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             "partner_responses": application['partner_responses'],
         }, 201
     except Exception as e:
-        logger.error(f"Financing application error: {str(e)}")
+        logger.error("Financing application error: %s", e)
         return {"error": "Internal server error"}, 500
 
 def handle_reply_feedback(post_id: str, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
@@ -3267,7 +3697,7 @@ def handle_reply_feedback(post_id: str, data: Dict[str, Any]) -> Tuple[Dict[str,
         save_feedback(posts)
         return {"reply": reply}, 201
     except Exception as e:
-        logger.error(f"Reply feedback error: {str(e)}")
+        logger.error("Reply feedback error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3377,7 +3807,7 @@ def _post_system_message(job_id: str, event: str, body: str,
               idempotency_key=f"msg.system:{job_id}:{event}:{message_id}")
         return msg
     except Exception as e:
-        logger.warning(f"system message failed {job_id}: {e}")
+        logger.warning("system message failed %s: %s", job_id, e)
         return None
 
 
@@ -3415,7 +3845,7 @@ def get_job_channel(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'my_read_ts': (ch.get('read_cursors') or {}).get(username, 0),
         }, 200
     except Exception as e:
-        logger.error(f"Get job channel error: {e}")
+        logger.error("Get job channel error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3506,7 +3936,7 @@ def post_job_channel_message(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]
 
         return msg, 201
     except Exception as e:
-        logger.error(f"Post channel message error: {e}")
+        logger.error("Post channel message error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3563,7 +3993,7 @@ def get_job_channel_messages(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]
             'my_read_ts': my_read,
         }, 200
     except Exception as e:
-        logger.error(f"Get channel messages error: {e}")
+        logger.error("Get channel messages error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3593,7 +4023,7 @@ def mark_job_channel_read(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         save_channel(job_id, ch)
         return {'job_id': job_id, 'last_read_ts': cursors[username]}, 200
     except Exception as e:
-        logger.error(f"Mark channel read error: {e}")
+        logger.error("Mark channel read error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3618,7 +4048,7 @@ def mark_chat_read(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         save_chat_cursors(username, cursors)
         return {'conversation_id': peer, 'last_read_ts': by_peer[peer]}, 200
     except Exception as e:
-        logger.error(f"Mark chat read error: {e}")
+        logger.error("Mark chat read error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3753,7 +4183,7 @@ def invite_job_party(data):
         except Exception:
             pass
 
-        logger.info(f"Job party invite ({side}): {job_id} {username} -> {member_username} ({share})")
+        logger.info("Job party invite (%s): %s %s -> %s (%s)", side, job_id, username, member_username, share)
         return {
             "job_id": job_id,
             "side": side,
@@ -3762,7 +4192,7 @@ def invite_job_party(data):
             "demand_party": job.get('demand_party', []),
         }, 201
     except Exception as e:
-        logger.error(f"Invite job party error: {str(e)}")
+        logger.error("Invite job party error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3837,7 +4267,7 @@ def respond_job_party(data):
 
         return {"job_id": job_id, "status": invite['status'], "side": side}, 200
     except Exception as e:
-        logger.error(f"Respond job party error: {str(e)}")
+        logger.error("Respond job party error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3873,7 +4303,7 @@ def get_job_party(data):
             "demand_party": demand_party,
         }, 200
     except Exception as e:
-        logger.error(f"Get job party error: {str(e)}")
+        logger.error("Get job party error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3960,7 +4390,7 @@ def create_agent(data):
             'expires_at': expires_at,
         }, 201
     except Exception as e:
-        logger.error(f"Create agent error: {str(e)}")
+        logger.error("Create agent error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -3984,7 +4414,7 @@ def list_agents(data):
             })
         return {'agents': agents}, 200
     except Exception as e:
-        logger.error(f"List agents error: {str(e)}")
+        logger.error("List agents error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4009,7 +4439,7 @@ def revoke_agent(data):
         save_account(username, user_data)
         return {'agent_id': agent_id, 'revoked': True}, 200
     except Exception as e:
-        logger.error(f"Revoke agent error: {str(e)}")
+        logger.error("Revoke agent error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4045,7 +4475,7 @@ def rotate_agent(data):
         save_account(username, user_data)
         return {'agent_id': agent_id, 'agent_token': secret, 'scopes': record['scopes']}, 200
     except Exception as e:
-        logger.error(f"Rotate agent error: {str(e)}")
+        logger.error("Rotate agent error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4125,17 +4555,17 @@ def create_campaign(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'commitments': [],
         }
         save_campaign(campaign_id, campaign)
-        logger.info(f"Campaign created: {campaign_id} by {username} ({units_needed} units @ {unit_price})")
+        logger.info("Campaign created: %s by %s (%s units @ %s)", campaign_id, username, units_needed, unit_price)
         return campaign, 201
     except Exception as e:
-        logger.error(f"Create campaign error: {str(e)}")
+        logger.error("Create campaign error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
-def _campaign_is_open(campaign: Dict[str, Any]) -> bool:
+def _campaign_is_open(campaign: Dict[str, Any], now: Optional[float] = None) -> bool:
     return (
         campaign.get('status') == 'open'
-        and campaign.get('end_time', 0) > time.time()
+        and campaign.get('end_time', 0) > (time.time() if now is None else now)
         and campaign.get('units_remaining', 0) > 0
     )
 
@@ -4149,8 +4579,9 @@ def get_campaigns(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         campaigns = get_all_campaigns()
         open_campaigns = []
+        now = time.time()
         for c in campaigns:
-            if not _campaign_is_open(c):
+            if not _campaign_is_open(c, now):
                 continue
             if category_filter:
                 service_str = json.dumps(c['service']) if isinstance(c['service'], dict) else str(c['service'])
@@ -4165,7 +4596,7 @@ def get_campaigns(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         open_campaigns.sort(key=lambda x: x['created_at'], reverse=True)
         return {"campaigns": open_campaigns[:limit]}, 200
     except Exception as e:
-        logger.error(f"Get campaigns error: {str(e)}")
+        logger.error("Get campaigns error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4178,7 +4609,7 @@ def get_campaign_detail(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             return {"error": "Campaign not found"}, 404
         return campaign, 200
     except Exception as e:
-        logger.error(f"Get campaign detail error: {str(e)}")
+        logger.error("Get campaign detail error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4228,10 +4659,10 @@ def commit_to_campaign(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         campaign['commitments'].append(commitment)
         save_campaign(campaign_id, campaign)
 
-        logger.info(f"Campaign commitment: {campaign_id} <- {username} ({units} units)")
+        logger.info("Campaign commitment: %s <- %s (%s units)", campaign_id, username, units)
         return {"campaign_id": campaign_id, "commitment": commitment}, 201
     except Exception as e:
-        logger.error(f"Commit to campaign error: {str(e)}")
+        logger.error("Commit to campaign error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4319,10 +4750,10 @@ def respond_campaign_commitment(campaign_id: str, commitment_id: str, data: Dict
             campaign['status'] = 'fulfilled'
         save_campaign(campaign_id, campaign)
 
-        logger.info(f"Campaign commitment accepted: {campaign_id}/{commitment_id} -> job {job_id}")
+        logger.info("Campaign commitment accepted: %s/%s -> job %s", campaign_id, commitment_id, job_id)
         return {"campaign_id": campaign_id, "commitment": commitment, "job": job_record}, 200
     except Exception as e:
-        logger.error(f"Respond campaign commitment error: {str(e)}")
+        logger.error("Respond campaign commitment error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4351,7 +4782,7 @@ def get_my_campaigns(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"owned_campaigns": owned, "my_commitments": committed}, 200
     except Exception as e:
-        logger.error(f"Get my campaigns error: {str(e)}")
+        logger.error("Get my campaigns error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -4390,7 +4821,7 @@ def submit_endorsement(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
         return {"target_username": target_username, "skill": skill, "message": "Endorsement recorded"}, 201
     except Exception as e:
-        logger.error(f"Submit endorsement error: {str(e)}")
+        logger.error("Submit endorsement error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4413,7 +4844,7 @@ def get_user_endorsements(username: str) -> Tuple[Dict[str, Any], int]:
 
         return {"username": username, "total_endorsements": len(endorsements), "skills": skills}, 200
     except Exception as e:
-        logger.error(f"Get user endorsements error: {str(e)}")
+        logger.error("Get user endorsements error: %s", e)
         return {"error": "Internal server error"}, 500
 
 # -----------------------------------------------------------------------------
@@ -4483,7 +4914,7 @@ def get_leaderboard() -> Tuple[Dict[str, Any], int]:
             "top_demand_collaborators": top_demand_collaborators[:10],
         }, 200
     except Exception as e:
-        logger.error(f"Get leaderboard error: {str(e)}")
+        logger.error("Get leaderboard error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4506,7 +4937,7 @@ def get_activity_me(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'note': 'Activity is append-only telemetry; marketplace job/bid records remain source of truth.',
         }, 200
     except Exception as e:
-        logger.error(f"get_activity_me error: {e}")
+        logger.error("get_activity_me error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4539,7 +4970,7 @@ def get_activity_for_job(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                 break
         return {'job_id': job_id, 'events': events}, 200
     except Exception as e:
-        logger.error(f"get_activity_for_job error: {e}")
+        logger.error("get_activity_for_job error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4623,7 +5054,7 @@ def get_portfolio(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             resp['canonical_portfolio'] = f"/portfolio/seat/{identity['seat_token_id']}"
         return resp, 200
     except Exception as e:
-        logger.error(f"get_portfolio error: {e}")
+        logger.error("get_portfolio error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4649,7 +5080,7 @@ def get_portfolio_by_seat(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             resp['canonical'] = True
         return resp, status
     except Exception as e:
-        logger.error(f"get_portfolio_by_seat error: {e}")
+        logger.error("get_portfolio_by_seat error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4671,7 +5102,7 @@ def export_history(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         }
         return export, 200
     except Exception as e:
-        logger.error(f"export_history error: {e}")
+        logger.error("export_history error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4737,7 +5168,7 @@ def export_job_proof(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             body['integrity']['hmac_sha256'] = sig
         return body, 200
     except Exception as e:
-        logger.error(f"export_job_proof error: {e}")
+        logger.error("export_job_proof error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4795,7 +5226,7 @@ def invite_campaign_sponsor(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             pass
         return {'campaign_id': campaign_id, 'sponsors': sponsors}, 201
     except Exception as e:
-        logger.error(f"invite_campaign_sponsor: {e}")
+        logger.error("invite_campaign_sponsor: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4828,7 +5259,7 @@ def respond_campaign_sponsor(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]
               idempotency_key=f"campaign.sponsor_{row['status']}:{campaign_id}:{username}")
         return {'campaign_id': campaign_id, 'status': row['status']}, 200
     except Exception as e:
-        logger.error(f"respond_campaign_sponsor: {e}")
+        logger.error("respond_campaign_sponsor: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4845,7 +5276,7 @@ def get_campaign_sponsors(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
             'sponsors': campaign.get('sponsors') or [],
         }, 200
     except Exception as e:
-        logger.error(f"get_campaign_sponsors: {e}")
+        logger.error("get_campaign_sponsors: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4855,7 +5286,7 @@ def _copy_sponsors_to_demand_party(job_record: Dict[str, Any], campaign: Dict[st
     sponsors.sort(key=lambda s: (s.get('responded_at') or 0, s.get('member_username') or ''))
     chosen = sponsors[:5]
     if len(sponsors) > 5:
-        logger.info(f"campaign_sponsor_job_copy_truncated count={len(sponsors)-5}")
+        logger.info("campaign_sponsor_job_copy_truncated count=%s", len(sponsors)-5)
     demand = job_record.setdefault('demand_party', [])
     now = int(time.time())
     for s in chosen:
@@ -4924,10 +5355,10 @@ def file_dispute(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
               payload={'dispute_id': dispute['dispute_id']},
               idempotency_key=f"dispute.filed:{dispute['dispute_id']}")
 
-        logger.info(f"Dispute filed: {dispute['dispute_id']} on job {job_id} by {username}")
+        logger.info("Dispute filed: %s on job %s by %s", dispute['dispute_id'], job_id, username)
         return dispute, 201
     except Exception as e:
-        logger.error(f"File dispute error: {str(e)}")
+        logger.error("File dispute error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4939,7 +5370,7 @@ def admin_list_disputes(status_filter: Optional[str] = None) -> Tuple[Dict[str,
             disputes = [d for d in disputes if d.get('status') == status_filter]
         return {"disputes": disputes}, 200
     except Exception as e:
-        logger.error(f"Admin list disputes error: {str(e)}")
+        logger.error("Admin list disputes error: %s", e)
         return {"error": "Internal server error"}, 500
 
 
@@ -4964,5 +5395,5 @@ def admin_resolve_dispute(dispute_id: str, data: Dict[str, Any]) -> Tuple[Dict[s
 
         return dispute, 200
     except Exception as e:
-        logger.error(f"Admin resolve dispute error: {str(e)}")
+        logger.error("Admin resolve dispute error: %s", e)
         return {"error": "Internal server error"}, 500
@@ -20,20 +20,24 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
-import uuid
+import secrets
 import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import config
 
 # ── Silence SSL warnings for self-signed certs on localhost ──────────────────
 import urllib3
+from urllib3.util.retry import Retry
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 def md5(text):
-    return hashlib.md5(text.encode()).hexdigest()
+    # Fixture fingerprint, not a credential — also keeps FIPS builds happy
+    return hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
 
 
 # ── 30 diverse service-matching test cases ───────────────────────────────────
@@ -371,37 +375,55 @@ MATCHING_TEST_CASES = [
 class ServiceExchangeAPITester:
     def __init__(self, api_url):
         self.api_url = api_url
+        # One keep-alive session for the whole run: each call otherwise pays
+        # a fresh TCP+TLS handshake. Retries cover connection errors (and
+        # idempotent GETs); POSTs are never resent after reaching the server.
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Overlaps calls that don't depend on each other. grab_job and the
+        # cleanup signing stay serial: they claim bids and read-modify-write
+        # shared accounts server-side.
+        self.executor = ThreadPoolExecutor(max_workers=8)
         self.created_users = []
         # List of (job_id, buyer_token, provider_token) for cleanup
         self.created_jobs = []
         self.active_tokens = []
+        self._auth_headers = {}
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
     def _register_and_login(self, username, user_type):
-        r = requests.post(f"{self.api_url}/register", json={
+        r = self.session.post(f"{self.api_url}/register", json={
             "username": username, "password": config.TEST_PASSWORD,
             "user_type": user_type,
-        }, verify=False)
+        })
         assert r.status_code == 201, f"Register failed for {username}: {r.status_code} {r.text}"
         self.created_users.append(username)
 
-        r = requests.post(f"{self.api_url}/login", json={
+        r = self.session.post(f"{self.api_url}/login", json={
             "username": username, "password": config.TEST_PASSWORD,
-        }, verify=False)
+        })
         assert r.status_code == 200, f"Login failed for {username}"
         token = r.json()["access_token"]
         self.active_tokens.append((token, username))
         return token
 
     def _headers(self, token):
-        return {"Authorization": f"Bearer {token}"}
+        # Built once per token; requests merges rather than mutates it
+        headers = self._auth_headers.get(token)
+        if headers is None:
+            headers = self._auth_headers[token] = {"Authorization": f"Bearer {token}"}
+        return headers
 
     def _post_bid(self, token, bid_data):
         """Submit a bid and return bid_id. Injects end_time if not set."""
         payload = {"end_time": int(time.time()) + 7200, **bid_data}
-        r = requests.post(f"{self.api_url}/submit_bid",
-                          headers=self._headers(token), json=payload, verify=False)
+        r = self.session.post(f"{self.api_url}/submit_bid",
+                              headers=self._headers(token), json=payload)
         assert r.status_code == 200, f"submit_bid failed: {r.status_code} {r.text}"
         return r.json()["bid_id"]
 
@@ -410,21 +432,20 @@ class ServiceExchangeAPITester:
                    "max_distance": max_distance}
         if address:
             payload["address"] = address
-        return requests.post(f"{self.api_url}/grab_job",
-                             headers=self._headers(token), json=payload, verify=False)
+        return self.session.post(f"{self.api_url}/grab_job",
+                                 headers=self._headers(token), json=payload)
 
     def _set_wallet(self, token, wallet_address):
-        r = requests.post(f"{self.api_url}/set_wallet",
-                          headers=self._headers(token),
-                          json={"wallet_address": wallet_address}, verify=False)
+        r = self.session.post(f"{self.api_url}/set_wallet",
+                              headers=self._headers(token),
+                              json={"wallet_address": wallet_address})
         return r.status_code == 200
 
     def _reject_job(self, token, job_id, reason="Test: returning to exchange"):
         """Reject a job so it goes back on the exchange for the real buyer."""
-        requests.post(f"{self.api_url}/reject_job",
-                      headers=self._headers(token),
-                      json={"job_id": job_id, "reason": reason},
-                      verify=False)
+        self.session.post(f"{self.api_url}/reject_job",
+                          headers=self._headers(token),
+                          json={"job_id": job_id, "reason": reason})
 
     # ── Cleanup ───────────────────────────────────────────────────────────────
 
@@ -438,32 +459,38 @@ class ServiceExchangeAPITester:
         for (job_id, buyer_token, provider_token) in self.created_jobs:
             try:
                 for tok in (provider_token, buyer_token):
-                    requests.post(f"{self.api_url}/sign_job",
-                                  headers=self._headers(tok),
-                                  json={"job_id": job_id, "rating": 5},
-                                  verify=False)
+                    self.session.post(f"{self.api_url}/sign_job",
+                                      headers=self._headers(tok),
+                                      json={"job_id": job_id, "rating": 5})
                 jobs_completed += 1
             except Exception as e:
                 print(f"  ⚠ Could not complete job {job_id[:8]}…: {e}")
 
-        # Cancel any remaining bids from test user accounts
+        # Cancel any remaining bids from test user accounts. Each cancel
+        # touches only its own bid, so they are issued concurrently.
+        def cancel(token, bid_id):
+            try:
+                return self.session.post(f"{self.api_url}/cancel_bid",
+                                         headers=self._headers(token),
+                                         json={"bid_id": bid_id}).status_code == 200
+            except Exception as e:
+                print(f"  ⚠ Could not cancel bid {bid_id[:8]}…: {e}")
+                return False
+
+        pending = []
         for token, username in self.active_tokens:
             try:
-                r = requests.get(f"{self.api_url}/my_bids",
-                                 headers=self._headers(token), verify=False)
+                r = self.session.get(f"{self.api_url}/my_bids",
+                                     headers=self._headers(token))
                 if r.status_code != 200:
                     continue
                 for bid in r.json().get("bids", []):
                     svc = str(bid.get("service", ""))
                     if "TEST:" in svc or bid.get("username") in self.created_users:
-                        resp = requests.post(f"{self.api_url}/cancel_bid",
-                                             headers=self._headers(token),
-                                             json={"bid_id": bid["bid_id"]},
-                                             verify=False)
-                        if resp.status_code == 200:
-                            bids_cancelled += 1
+                        pending.append(self.executor.submit(cancel, token, bid["bid_id"]))
             except Exception as e:
                 print(f"  ⚠ Error cleaning up for {username}: {e}")
+        bids_cancelled = sum(f.result() for f in pending)
 
         print(f"  Bids cancelled: {bids_cancelled}")
         print(f"  Jobs completed: {jobs_completed}")
@@ -477,15 +504,16 @@ class ServiceExchangeAPITester:
         print(f"Environment: {self.api_url}")
 
         # Health check
-        r = requests.get(f"{self.api_url}/ping", verify=False)
+        r = self.session.get(f"{self.api_url}/ping")
         assert r.status_code == 200, "API ping failed"
         print("✓ Health check")
 
-        buyer_username = f"buyer_{uuid.uuid4().hex[:8]}"
-        provider_username = f"prov_{uuid.uuid4().hex[:8]}"
+        buyer_username = f"buyer_{secrets.token_hex(4)}"
+        provider_username = f"prov_{secrets.token_hex(4)}"
 
-        buyer_token = self._register_and_login(buyer_username, "demand")
-        provider_token = self._register_and_login(provider_username, "supply")
+        buyer_token, provider_token = self.executor.map(
+            self._register_and_login,
+            [buyer_username, provider_username], ["demand", "supply"])
         print(f"✓ Users created ({buyer_username}, {provider_username})")
 
         # Link the real seat wallet for the provider
@@ -508,11 +536,11 @@ class ServiceExchangeAPITester:
                 "location_type": "remote",
             },
         ]
-        bid_ids = [self._post_bid(buyer_token, b) for b in bids]
+        bid_ids = list(self.executor.map(lambda b: self._post_bid(buyer_token, b), bids))
         print(f"✓ Bids submitted: {len(bid_ids)}")
 
-        r = requests.get(f"{self.api_url}/my_bids",
-                         headers=self._headers(buyer_token), verify=False)
+        r = self.session.get(f"{self.api_url}/my_bids",
+                             headers=self._headers(buyer_token))
         assert r.status_code == 200
         assert len(r.json().get("bids", [])) >= len(bids)
         print("✓ my_bids")
@@ -533,27 +561,30 @@ class ServiceExchangeAPITester:
             else:
                 print(f"  (No match for '{caps[:30]}…')")
 
-        r = requests.get(f"{self.api_url}/account",
-                         headers=self._headers(buyer_token), verify=False)
+        account = self.executor.submit(
+            self.session.get, f"{self.api_url}/account",
+            headers=self._headers(buyer_token))
+        chat = self.executor.submit(
+            self.session.post, f"{self.api_url}/chat",
+            headers=self._headers(buyer_token),
+            json={"recipient": provider_username,
+                  "message": "TEST: Hello from integration test"})
+        bulletin = self.executor.submit(
+            self.session.post, f"{self.api_url}/bulletin",
+            headers=self._headers(buyer_token),
+            json={"title": "TEST: Integration Test Post",
+                  "content": "Automated test bulletin.",
+                  "category": "general"})
+
+        r = account.result()
         assert r.status_code == 200
         assert r.json()["username"] == buyer_username
         print("✓ Account info")
 
-        r = requests.post(f"{self.api_url}/chat",
-                          headers=self._headers(buyer_token),
-                          json={"recipient": provider_username,
-                                "message": "TEST: Hello from integration test"},
-                          verify=False)
-        assert r.status_code == 200
+        assert chat.result().status_code == 200
         print("✓ Chat")
 
-        r = requests.post(f"{self.api_url}/bulletin",
-                          headers=self._headers(buyer_token),
-                          json={"title": "TEST: Integration Test Post",
-                                "content": "Automated test bulletin.",
-                                "category": "general"},
-                          verify=False)
-        assert r.status_code == 200
+        assert bulletin.result().status_code == 200
         print("✓ Bulletin")
 
         # Bid cancellation
@@ -562,18 +593,18 @@ class ServiceExchangeAPITester:
             "price": 100, "currency": "USD", "payment_method": "cash",
             "location_type": "remote",
         })
-        r = requests.post(f"{self.api_url}/cancel_bid",
-                          headers=self._headers(buyer_token),
-                          json={"bid_id": cancel_id}, verify=False)
+        r = self.session.post(f"{self.api_url}/cancel_bid",
+                              headers=self._headers(buyer_token),
+                              json={"bid_id": cancel_id})
         assert r.status_code == 200
         print("✓ Bid cancellation")
 
         # Input validation
-        r = requests.post(f"{self.api_url}/submit_bid",
-                          headers=self._headers(buyer_token),
-                          json={"service": "Invalid bid", "price": -100,
-                                "end_time": int(time.time()) + 3600,
-                                "location_type": "remote"}, verify=False)
+        r = self.session.post(f"{self.api_url}/submit_bid",
+                              headers=self._headers(buyer_token),
+                              json={"service": "Invalid bid", "price": -100,
+                                    "end_time": int(time.time()) + 3600,
+                                    "location_type": "remote"})
         assert r.status_code == 400
         print("✓ Negative price rejected")
 
@@ -584,11 +615,12 @@ class ServiceExchangeAPITester:
     def test_service_matching(self):
         print(f"\n=== Service Matching Tests ({len(MATCHING_TEST_CASES)} cases) ===")
 
-        buyer_username = f"mbuy_{uuid.uuid4().hex[:7]}"
-        prov_username  = f"mpro_{uuid.uuid4().hex[:7]}"
+        buyer_username = f"mbuy_{secrets.token_hex(4)[:7]}"
+        prov_username  = f"mpro_{secrets.token_hex(4)[:7]}"
 
-        buyer_token   = self._register_and_login(buyer_username,  "demand")
-        prov_token    = self._register_and_login(prov_username,   "supply")
+        buyer_token, prov_token = self.executor.map(
+            self._register_and_login,
+            [buyer_username, prov_username], ["demand", "supply"])
 
         # Link the real seat wallet (seats #1-100) to the test provider
         if self._set_wallet(prov_token, config.TEST_WALLET_ADDRESS):
@@ -666,15 +698,15 @@ class ServiceExchangeAPITester:
                     external_grabs += 1
                     non_match_note = (non_match_note +
                                       " FN: matched external bid instead of ours").strip()
-                    requests.post(f"{self.api_url}/cancel_bid",
-                                  headers=self._headers(buyer_token),
-                                  json={"bid_id": bid_id}, verify=False)
+                    self.session.post(f"{self.api_url}/cancel_bid",
+                                      headers=self._headers(buyer_token),
+                                      json={"bid_id": bid_id})
 
             elif r.status_code == 204:
                 # Our bid is still in pool but LLM said no — cancel it.
-                requests.post(f"{self.api_url}/cancel_bid",
-                              headers=self._headers(buyer_token),
-                              json={"bid_id": bid_id}, verify=False)
+                self.session.post(f"{self.api_url}/cancel_bid",
+                                  headers=self._headers(buyer_token),
+                                  json={"bid_id": bid_id})
 
             results.append((name, non_match_ok, match_ok, non_match_note))
 
@@ -715,36 +747,39 @@ class ServiceExchangeAPITester:
     def test_advanced_features(self):
         print("\n=== Advanced Feature Tests ===")
 
-        username = f"adv_{uuid.uuid4().hex[:8]}"
+        username = f"adv_{secrets.token_hex(4)}"
         token = self._register_and_login(username, "demand")
 
-        r = requests.post(f"{self.api_url}/submit_bid",
-                          headers=self._headers(token), json={
-                              "service": {
-                                  "type": "TEST: Advanced service",
-                                  "description": "Complex multi-step service",
-                                  "requirements": ["professional", "insured", "experienced"],
-                              },
-                              "price": 500, "currency": "USD", "payment_method": "xmoney",
-                              "xmoney_account": "@test_account",
-                              "end_time": int(time.time()) + 3600,
-                              "location_type": "hybrid",
-                              "address": "789 Advanced St, Denver, CO 80204",
-                          }, verify=False)
+        r = self.session.post(f"{self.api_url}/submit_bid",
+                              headers=self._headers(token), json={
+                                  "service": {
+                                      "type": "TEST: Advanced service",
+                                      "description": "Complex multi-step service",
+                                      "requirements": ["professional", "insured", "experienced"],
+                                  },
+                                  "price": 500, "currency": "USD", "payment_method": "xmoney",
+                                  "xmoney_account": "@test_account",
+                                  "end_time": int(time.time()) + 3600,
+                                  "location_type": "hybrid",
+                                  "address": "789 Advanced St, Denver, CO 80204",
+                              })
         assert r.status_code == 200
         print("✓ Enhanced bid with XMoney payment")
 
-        r = requests.get(f"{self.api_url}/exchange_data?category=TEST&limit=10",
-                         headers=self._headers(token), verify=False)
+        exchange = self.executor.submit(
+            self.session.get, f"{self.api_url}/exchange_data?category=TEST&limit=10",
+            headers=self._headers(token))
+        nearby = self.executor.submit(
+            self.session.post, f"{self.api_url}/nearby",
+            headers=self._headers(token),
+            json={"address": "Downtown Denver, CO", "radius": 15})
+
+        r = exchange.result()
         assert r.status_code == 200
         assert "active_bids" in r.json()
         print("✓ Exchange data endpoint")
 
-        r = requests.post(f"{self.api_url}/nearby",
-                          headers=self._headers(token),
-                          json={"address": "Downtown Denver, CO", "radius": 15},
-                          verify=False)
-        assert r.status_code == 200
+        assert nearby.result().status_code == 200
         print("✓ Nearby services")
 
         print("✓ Advanced features passed")
@@ -792,6 +827,8 @@ def main():
         return 1
     finally:
         tester.cleanup()
+        tester.executor.shutdown()
+        tester.session.close()
 
     return 0
 
@@ -36,6 +36,7 @@ import json
 import logging
 import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -79,8 +80,13 @@ def _get_contract():
     return _contract
 
 
+@lru_cache(maxsize=4096)
 def normalize_address(address: str) -> Optional[str]:
-    """Return EIP-55 checksum address, or None if invalid."""
+    """Return EIP-55 checksum address, or None if invalid.
+
+    Memoised: the checksum is a keccak-256 over the address, and the same
+    few wallets are re-verified on every /account and /set_wallet call.
+    """
     if not _WEB3_AVAILABLE:
         return None
     try:
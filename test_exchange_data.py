@@ -0,0 +1,49 @@
+"""Unit tests for get_exchange_data listing and market stats."""
+import time
+
+import pytest
+
+pytest.importorskip("config")  # handlers needs a local config.py
+import handlers
+
+
+def _bid(i, now, **extra):
+    bid = {"bid_id": f"b{i}", "service": f"lawn mowing {i}", "price": 10 + i,
+           "end_time": now + 3600, "created_at": now - i}
+    bid.update(extra)
+    return bid
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    now = int(time.time())
+    bids = [_bid(i, now) for i in range(5)] + [_bid(9, now, end_time=now - 1)]
+    jobs = [
+        {"job_id": "j1", "service": "lawn", "price": 20, "status": "completed",
+         "accepted_at": now - 7200, "completed_at": now - 60},
+        {"job_id": "j2", "service": "lawn", "price": 30, "status": "completed",
+         "accepted_at": now - 3 * 86400, "completed_at": now - 2 * 86400},
+        {"job_id": "j3", "service": "lawn", "price": 40, "status": "accepted",
+         "accepted_at": now - 60},
+    ]
+    monkeypatch.setattr(handlers, "get_all_bids", lambda: bids)
+    monkeypatch.setattr(handlers, "get_all_jobs", lambda: jobs)
+    return bids, jobs
+
+
+def test_limit_zero_still_reports_stats(exchange):
+    result, status = handlers.get_exchange_data({"limit": 0, "include_completed": True})
+    assert status == 200
+    assert result["active_bids"] == [] and result["completed_jobs"] == []
+    assert result["market_stats"] == {"total_active_bids": 5, "total_completed_today": 1}
+
+
+def test_limit_selects_newest(exchange):
+    result, _ = handlers.get_exchange_data({"limit": 2, "include_completed": True})
+    assert [b["bid_id"] for b in result["active_bids"]] == ["b0", "b1"]
+    assert [j["job_id"] for j in result["completed_jobs"]] == ["j1", "j2"]
+    assert result["market_stats"] == {"total_active_bids": 5, "total_completed_today": 1}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,76 @@
+"""Unit tests for vectorised geo helpers."""
+import math
+
+import numpy as np
+
+import geo
+
+
+def _scalar_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 3959 * 2 * math.asin(math.sqrt(a))
+
+
+def test_matches_scalar():
+    lats = np.array([39.7431, 39.8561, 40.0150, 39.7392])
+    lons = np.array([-104.9792, -104.6737, -105.2705, -104.9903])
+    out = geo.haversine_miles(39.7392, -104.9903, lats, lons)
+    for i in range(len(lats)):
+        assert abs(out[i] - _scalar_haversine(39.7392, -104.9903, lats[i], lons[i])) < 1e-9
+    assert out[-1] == 0
+
+
+def test_missing_coords_are_nan():
+    bids = [
+        {"lat": 39.74, "lon": -104.99},
+        {"lat": None, "lon": -104.99},
+        {"lat": "39.75", "lon": "-104.98"},
+        {"lat": "n/a", "lon": -104.99},
+        {},
+    ]
+    lats, lons = geo.coordinate_arrays(bids)
+    assert lats[0] == 39.74 and lats[2] == 39.75
+    assert np.isnan(lats[[1, 3, 4]]).all() and np.isnan(lons[[1, 3, 4]]).all()
+    d = geo.haversine_miles(39.74, -104.99, lats, lons)
+    assert list(d <= 10) == [True, False, True, False, False]
+
+
+def test_out_buffer_and_antipodal():
+    lats = np.array([0.0, 10.0])
+    lons = np.array([180.0, 20.0])
+    out = np.empty(2)
+    d = geo.haversine_miles(0.0, 0.0, lats, lons, out=out)
+    assert d is out
+    assert abs(d[0] - math.pi * geo.EARTH_RADIUS_MILES) < 1e-6
+    assert list(lats) == [0.0, 10.0]  # inputs untouched
+
+
+def test_bounding_box_never_drops_points_in_radius():
+    rng = np.random.default_rng(7)
+    for lat0, lon0 in [(39.74, -104.99), (0.0, 179.9), (89.5, 10.0)]:
+        for radius in (1, 25, 500):
+            lats = np.clip(lat0 + rng.normal(0, radius / 50, 2000), -90, 90)
+            lons = (lon0 + rng.normal(0, radius / 20, 2000) + 180) % 360 - 180
+            inside = geo.haversine_miles(lat0, lon0, lats, lons) <= radius
+            assert geo.bounding_box_mask(lat0, lon0, lats, lons, radius)[inside].all()
+
+
+def test_small_radius_approximation_close_to_haversine():
+    rng = np.random.default_rng(3)
+    lats = 39.74 + rng.uniform(-0.7, 0.7, 2000)
+    lons = -104.99 + rng.uniform(-0.9, 0.9, 2000)
+    exact = geo.haversine_miles(39.74, -104.99, lats, lons)
+    approx = geo.distance_miles_within(39.74, -104.99, lats, lons, 40)
+    near = exact <= 40
+    assert np.abs(approx[near] - exact[near]).max() < 0.005
+    assert np.isinf(approx[~geo.bounding_box_mask(39.74, -104.99, lats, lons, 40)]).all()
+
+
+if __name__ == "__main__":
+    test_matches_scalar()
+    test_missing_coords_are_nan()
+    test_out_buffer_and_antipodal()
+    test_bounding_box_never_drops_points_in_radius()
+    test_small_radius_approximation_close_to_haversine()
+    print("ok")
@@ -0,0 +1,43 @@
+"""Unit tests for the streamed single-match early stop."""
+import json
+
+import pytest
+
+pytest.importorskip("config")  # handlers needs a local config.py
+import handlers
+
+
+class _FakeStream:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.read = 0
+
+    def iter_lines(self, decode_unicode=True):
+        for piece in self.pieces:
+            self.read += 1
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": piece}}]})
+        yield "data: [DONE]"
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("text", ["NOT", "NOTE:", "I KNOW", "CANNOT TELL", "NONE", "NO"])
+def test_no_verdict_in_partial_words(text):
+    assert not handlers._has_verdict(text)
+
+
+@pytest.mark.parametrize("text", ["YES.", "no\n", "Answer: NO, sorry", "yes "])
+def test_whole_word_verdict(text):
+    assert handlers._has_verdict(text)
+
+
+def test_note_before_yes_reads_to_the_verdict():
+    stream = _FakeStream(["NO", "TE: the provider", " can do it. ", "YES", ".", " Extra"])
+    answer = handlers._read_openrouter_stream(stream, handlers._has_verdict)
+    assert answer == "NOTE: the provider can do it. YES."
+    assert stream.read == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -5,10 +5,13 @@ Handles Digital Ocean Spaces-based persistence for the application.
 All data stored in Digital Ocean Spaces (S3-compatible) for durability and scalability.
 """
 
+import hashlib
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from typing import Dict, List, Optional, Any, Tuple
 import config
@@ -25,7 +28,11 @@ _mem_cache_ts: Dict[str, float] = {}
 # TTL per key prefix (seconds)
 # Short account TTL: multi-worker gunicorn cannot share memory; long TTLs cause
 # read-your-writes bugs (e.g. empty GET /agents right after create).
-_TTL_ACCOUNTS = 2
+# Single-worker deployments can raise it via ACCOUNT_CACHE_TTL_SECONDS; writes
+# from this process refresh the cache either way (save_account -> _s3_put).
+# 0 turns the account cache off entirely; only unset/None means the default.
+_account_ttl = getattr(config, 'ACCOUNT_CACHE_TTL_SECONDS', None)
+_TTL_ACCOUNTS = 2.0 if _account_ttl is None else float(_account_ttl)
 _TTL_TOKENS = 300
 _TTL_BIDS = 15
 # Short job TTL: multi-worker sign/party RMW must not serve stale job docs.
@@ -48,9 +55,9 @@ def _cache_ttl_for(key: str) -> float:
     return _TTL_STATS
 
 
-def _cache_get(key: str) -> Optional[Any]:
+def _cache_get(key: str, now: Optional[float] = None) -> Optional[Any]:
     ts = _mem_cache_ts.get(key, 0)
-    if time.time() - ts < _cache_ttl_for(key):
+    if (time.time() if now is None else now) - ts < _cache_ttl_for(key):
         return _mem_cache.get(key)
     return None
 
@@ -79,6 +86,11 @@ def _parse_do_url(url: str):
 DO_BUCKET, DO_REGION = _parse_do_url(config.DO_SPACES_URL)
 DO_ENDPOINT = f"https://{DO_REGION}.digitaloceanspaces.com"
 
+# Connection pool for the Spaces client. botocore defaults to 10 pooled
+# connections with no TCP keepalive; gunicorn threads fanning out over bid/job
+# listings exhaust that quickly and pay a fresh TLS handshake on every miss.
+S3_MAX_POOL_CONNECTIONS = int(getattr(config, 'S3_MAX_POOL_CONNECTIONS', 64) or 64)
+
 # Initialize Digital Ocean Spaces client (S3-compatible)
 try:
     s3_client = boto3.client(
@@ -86,7 +98,11 @@ try:
         aws_access_key_id=config.DO_SPACES_KEY,
         aws_secret_access_key=config.DO_SPACES_SECRET,
         endpoint_url=DO_ENDPOINT,
-        region_name=DO_REGION
+        region_name=DO_REGION,
+        config=BotoConfig(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+        ),
     )
     logger.info(f"Digital Ocean Spaces client initialized: bucket={DO_BUCKET}, region={DO_REGION}, prefix={config.S3_PREFIX}")
 except Exception as e:
@@ -119,6 +135,8 @@ CHANNELS_PREFIX = f"{S3_PREFIX}/channels"
 CHANNEL_MESSAGES_PREFIX = f"{S3_PREFIX}/channel_messages"
 CHAT_CURSORS_PREFIX = f"{S3_PREFIX}/chat_cursors"
 CONTACT_HASHES_PREFIX = f"{S3_PREFIX}/contact_hashes"
+GEOCODES_PREFIX = f"{S3_PREFIX}/geocodes"
+BID_CLAIMS_PREFIX = f"{S3_PREFIX}/bid_claims"
 
 # -----------------------------------------------------------------------------
 # S3 Helper Functions
@@ -139,6 +157,26 @@ def _s3_put(key: str, data: Dict[str, Any]) -> bool:
         logger.error(f"S3 PUT error for {key}: {e}")
         return False
 
+def _s3_put_if_absent(key: str, data: Dict[str, Any]) -> bool:
+    """Create a JSON object only if the key does not exist yet (conditional PUT).
+
+    Returns False if another writer created it first or the write failed.
+    """
+    try:
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=json.dumps(data),
+            ContentType='application/json',
+            IfNoneMatch='*'
+        )
+        _cache_set(key, data)
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            logger.error(f"S3 conditional PUT error for {key}: {e}")
+        return False
+
 def _s3_put_binary(key: str, body: bytes, content_type: str) -> bool:
     """Save raw binary data to S3 (e.g. uploaded images), publicly readable."""
     try:
@@ -161,7 +199,8 @@ def _s3_get(key: str) -> Optional[Dict[str, Any]]:
         return cached
     try:
         response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
-        data = json.loads(response['Body'].read().decode('utf-8'))
+        # json.loads detects UTF-8 on bytes itself; skip the intermediate str
+        data = json.loads(response['Body'].read())
         _cache_set(key, data)
         return data
     except ClientError as e:
@@ -173,6 +212,35 @@ def _s3_get(key: str) -> Optional[Dict[str, Any]]:
         logger.error(f"JSON decode error for {key}: {e}")
         return None
 
+# Cold full scans (get_all_bids etc.) issue one GET per object; running them
+# on a small pool turns N sequential round trips into ~N/16. The client's
+# connection pool (S3_MAX_POOL_CONNECTIONS) is sized well above this.
+_S3_GET_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='s3-get')
+
+def _s3_get_or_none(key: str) -> Optional[Dict[str, Any]]:
+    """_s3_get that logs transport errors (read timeouts etc.) and returns None."""
+    try:
+        return _s3_get(key)
+    except Exception as e:
+        logger.error(f"S3 GET error for {key}: {e}")
+        return None
+
+def _s3_get_many(keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """_s3_get for several keys, in order; cache misses are fetched concurrently.
+
+    A key whose GET fails comes back as None; the other results are kept.
+    """
+    now = time.time()
+    results = [_cache_get(key, now) for key in keys]
+    missing = [i for i, data in enumerate(results) if data is None]
+    if len(missing) == 1:
+        results[missing[0]] = _s3_get_or_none(keys[missing[0]])
+    elif missing:
+        fetched = _S3_GET_EXECUTOR.map(_s3_get_or_none, [keys[i] for i in missing])
+        for i, data in zip(missing, fetched):
+            results[i] = data
+    return results
+
 def _s3_exists(key: str) -> bool:
     """Check if an object exists in S3 (cache-aware)."""
     if _cache_get(key) is not None:
@@ -212,11 +280,18 @@ def _s3_list(prefix: str) -> List[str]:
 # Account Management
 # -----------------------------------------------------------------------------
 
+# Usernames confirmed to exist. Accounts are never deleted, so a positive
+# answer stays true; misses always go to S3 so new registrations in other
+# workers are seen immediately.
+_known_accounts: set = set()
+
 def save_account(username: str, data: Dict[str, Any]) -> None:
     """Save account data to S3 and refresh local cache."""
     key = f"{ACCOUNTS_PREFIX}/{username}.json"
     if not _s3_put(key, data):
         logger.error(f"Failed to save account {username}")
+    else:
+        _known_accounts.add(username)
 
 def get_account(username: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
     """Retrieve account data from S3.
@@ -230,21 +305,24 @@ def get_account(username: str, force_refresh: bool = False) -> Optional[Dict[str
     return _s3_get(key)
 
 def account_exists(username: str) -> bool:
-    """Check if an account exists in S3."""
+    """Check if an account exists in S3 (positive answers are memoised)."""
+    if username in _known_accounts:
+        return True
     key = f"{ACCOUNTS_PREFIX}/{username}.json"
-    return _s3_exists(key)
+    if _s3_exists(key):
+        _known_accounts.add(username)
+        return True
+    return False
 
 def get_all_accounts() -> List[Tuple[str, Dict[str, Any]]]:
     """Retrieve all accounts as (username, data) pairs from S3. Full scan — used for admin/leaderboard views."""
     accounts = []
     try:
-        keys = _s3_list(ACCOUNTS_PREFIX)
-        for key in keys:
-            if key.endswith('.json'):
-                data = _s3_get(key)
-                if data:
-                    username = key.rsplit('/', 1)[-1][:-5]
-                    accounts.append((username, data))
+        keys = [key for key in _s3_list(ACCOUNTS_PREFIX) if key.endswith('.json')]
+        for key, data in zip(keys, _s3_get_many(keys)):
+            if data:
+                username = key.rsplit('/', 1)[-1][:-5]
+                accounts.append((username, data))
     except Exception as e:
         logger.error(f"Error loading accounts: {e}")
     return accounts
@@ -435,9 +513,15 @@ def save_bid(bid_id: str, data: Dict[str, Any]) -> None:
     if not _s3_put(key, data):
         logger.error(f"Failed to save bid {bid_id}")
 
-def get_bid(bid_id: str) -> Optional[Dict[str, Any]]:
-    """Retrieve bid data from S3."""
+def get_bid(bid_id: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Retrieve bid data from S3.
+
+    force_refresh=True bypasses the in-process cache — required before
+    claiming a bid, since another worker may have taken it within the TTL.
+    """
     key = f"{BIDS_PREFIX}/{bid_id}.json"
+    if force_refresh:
+        _cache_delete(key)
     return _s3_get(key)
 
 def delete_bid(bid_id: str) -> None:
@@ -446,16 +530,27 @@ def delete_bid(bid_id: str) -> None:
     if not _s3_delete(key):
         logger.error(f"Failed to delete bid {bid_id}")
 
+def claim_bid(bid_id: str, username: str) -> bool:
+    """Atomically claim a bid across all workers via a conditional PUT.
+
+    Exactly one caller gets True for a given bid_id; the marker is kept so a
+    worker holding a stale copy of the bid can never claim it later.
+    """
+    key = f"{BID_CLAIMS_PREFIX}/{bid_id}.json"
+    return _s3_put_if_absent(key, {'bid_id': bid_id, 'username': username, 'claimed_at': int(time.time())})
+
+def release_bid_claim(bid_id: str) -> None:
+    """Drop a bid claim so the bid can be grabbed again."""
+    key = f"{BID_CLAIMS_PREFIX}/{bid_id}.json"
+    if not _s3_delete(key):
+        logger.error(f"Failed to release claim on bid {bid_id}")
+
 def get_all_bids() -> List[Dict[str, Any]]:
     """Retrieve all active bids from S3."""
     bids = []
     try:
-        keys = _s3_list(BIDS_PREFIX)
-        for key in keys:
-            if key.endswith('.json'):
-                bid = _s3_get(key)
-                if bid:
-                    bids.append(bid)
+        keys = [key for key in _s3_list(BIDS_PREFIX) if key.endswith('.json')]
+        bids = [bid for bid in _s3_get_many(keys) if bid]
     except Exception as e:
         logger.error(f"Error loading bids: {e}")
     return bids
@@ -468,11 +563,13 @@ def get_user_bids(username: str) -> List[Dict[str, Any]]:
 # Job Management
 # -----------------------------------------------------------------------------
 
-def save_job(job_id: str, data: Dict[str, Any]) -> None:
-    """Save job data to S3."""
+def save_job(job_id: str, data: Dict[str, Any]) -> bool:
+    """Save job data to S3. Returns False if the write failed."""
     key = f"{JOBS_PREFIX}/{job_id}.json"
     if not _s3_put(key, data):
         logger.error(f"Failed to save job {job_id}")
+        return False
+    return True
 
 def get_job(job_id: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
     """Retrieve job data from S3.
@@ -489,12 +586,8 @@ def get_all_jobs() -> List[Dict[str, Any]]:
     """Retrieve all jobs from S3."""
     jobs = []
     try:
-        keys = _s3_list(JOBS_PREFIX)
-        for key in keys:
-            if key.endswith('.json'):
-                job = _s3_get(key)
-                if job:
-                    jobs.append(job)
+        keys = [key for key in _s3_list(JOBS_PREFIX) if key.endswith('.json')]
+        jobs = [job for job in _s3_get_many(keys) if job]
     except Exception as e:
         logger.error(f"Error loading jobs: {e}")
     return jobs
@@ -728,6 +821,24 @@ def save_contact_hash_record(contact_hash: str, username: str) -> None:
         logger.error(f"Failed to save contact hash for {username}")
 
 
+def _geocode_key(address_key: str) -> str:
+    digest = hashlib.sha256(address_key.encode('utf-8')).hexdigest()
+    return f"{GEOCODES_PREFIX}/{digest}.json"
+
+
+def get_geocode_record(address_key: str) -> Optional[Dict[str, Any]]:
+    """Shared geocode result for a normalised address, if any worker resolved it."""
+    data = _s3_get(_geocode_key(address_key))
+    return data if isinstance(data, dict) else None
+
+
+def save_geocode_record(address_key: str, lat: Optional[float], lon: Optional[float]) -> None:
+    """Persist a definitive geocode answer (lat/lon None = no such place)."""
+    record = {'lat': lat, 'lon': lon, 'resolved_at': int(time.time())}
+    if not _s3_put(_geocode_key(address_key), record):
+        logger.error(f"Failed to save geocode for {address_key!r}")
+
+
 def delete_contact_hash_record(contact_hash: str) -> None:
     if not contact_hash:
         return